@@ -6,26 +6,400 @@ Part of WolfCog AGI-OS persistent agent infrastructure
 Implements Prolog-style logical reasoning for system coordination
 """
 
+import collections
 import json
+import logging
+import math
 import time
 import threading
 import hashlib
+import heapq
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Hot-path messages (facts, rules, per-file removals) are logged at DEBUG
+logger = logging.getLogger("wolfcog.director")
+if not logger.handlers:
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_stream_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Prefer SIMD xxh3 for content hashing when installed
+try:
+    import xxhash
+    
+    def new_content_hash():
+        return xxhash.xxh3_128()
+except ImportError:
+    def new_content_hash():
+        return hashlib.blake2b(digest_size=16)
+
+# Prefer orjson for parsing task files when installed
+try:
+    import orjson
+    
+    def json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def json_loads(data):
+        return json.loads(data)
+
+# Most task files name their space near the top, so a prefix scan avoids parsing
+TASK_SPACE_RE = re.compile(rb'"space"\s*:\s*"([use])"')
+TASK_HEAD_SIZE = 4096
+
+# Filename categories for organize_by_pattern, fused into one alternation;
+# the first matching group decides the category
+FILE_PATTERN_RE = re.compile(
+    r"(?P<symbolic>.*[∇∂⊗Φ].*)|"
+    r"(?P<numeric>.*\d+.*)|"
+    r"(?P<temporal>.*(?:time|[0-9]{8}).*)|"
+    r"(?P<config>.*\.(?:json|yaml|conf)$)"
+)
+
+# NumPy vectorizes size bucketing and age filtering on large spaces
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Filesystem notifications let the agent skip polling the watched directories
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# MinHash sketches extend dedup to near-identical files
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
+# Below this many files the plain Python loops are faster than converting to arrays
+VECTORIZE_MIN_FILES = 1000
+
+# Duplicate candidates are compared on this prefix before hashing in full
+DEDUP_PREFIX_SIZE = 64 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Near-duplicate detection: byte 4-gram shingles, Jaccard threshold, and the
+# size band a file needs a neighbour in before it is sketched at all
+NEAR_DUP_SHINGLE = 4
+NEAR_DUP_THRESHOLD = 0.95
+NEAR_DUP_PERMUTATIONS = 128
+NEAR_DUP_MIN_SIZE = 256
+NEAR_DUP_MAX_SIZE = 1024 * 1024
+# Shingles hashed per update_batch call; each call allocates a shingles x
+# permutations uint64 matrix, so this bounds sketching memory (~8 MB)
+NEAR_DUP_BATCH = 8192
+# Near-duplicates are moved here, under the space, rather than deleted
+NEAR_DUP_DIR = "near_duplicates"
+
+
+def hash_file(path, limit=None):
+    """Content hash of a file, or of its first limit bytes
+    
+    Memory use is bounded by the read buffer regardless of file size.
+    """
+    if limit is None and hasattr(hashlib, "file_digest"):
+        # Python 3.11+: C-level buffered loop that releases the GIL while hashing
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, new_content_hash).hexdigest()
+    
+    digest = new_content_hash()
+    remaining = limit
+    with open(path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            chunk_size = HASH_CHUNK_SIZE if remaining is None else min(HASH_CHUNK_SIZE, remaining)
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def make_rule_matcher(conditions, parsed_conditions):
+    """Specialize a rule's conditions into one function of (facts, fact_index)
+    
+    The function returns the facts supporting the rule, or None if a condition is
+    unmatched; it applies the same matching as DirectorAgent.matches_facts.
+    """
+    checks = [(condition, predicate, bool(paren))
+              for condition, (predicate, paren, _) in zip(conditions, parsed_conditions)]
+    
+    def matcher(facts, fact_index):
+        support = set()
+        for condition, predicate, is_pattern in checks:
+            if condition in facts:
+                support.add(condition)
+            elif is_pattern and predicate in fact_index:
+                support.update(fact_index[predicate])
+            else:
+                return None
+        return frozenset(support)
+    
+    return matcher
+
+
+def minhash_file(path):
+    """MinHash sketch of the byte shingles of a file"""
+    with open(path, 'rb') as f:
+        data = f.read(NEAR_DUP_MAX_SIZE)
+    sketch = MinHash(num_perm=NEAR_DUP_PERMUTATIONS)
+    shingle_count = len(data) - NEAR_DUP_SHINGLE + 1
+    for start in range(0, shingle_count, NEAR_DUP_BATCH):
+        end = min(start + NEAR_DUP_BATCH, shingle_count)
+        sketch.update_batch({data[i:i + NEAR_DUP_SHINGLE] for i in range(start, end)})
+    return sketch
+
+
+def append_file(outfile, infile):
+    """Append the rest of binary file infile to outfile
+    
+    Uses in-kernel os.sendfile where available, falling back to a buffered copy.
+    outfile should be unbuffered so sendfile writes land at the right position.
+    """
+    offset = infile.tell()
+    if hasattr(os, "sendfile"):
+        try:
+            size = os.fstat(infile.fileno()).st_size
+            while offset < size:
+                sent = os.sendfile(outfile.fileno(), infile.fileno(), offset, size - offset)
+                if sent == 0:
+                    return
+                offset += sent
+            return
+        except OSError:
+            # Unsupported for this pair of files; copy whatever is left
+            infile.seek(offset)
+    shutil.copyfileobj(infile, outfile, COPY_CHUNK_SIZE)
+
+
+def group_by(items, key, executor=None):
+    """Group items by key(item), preserving encounter order; unreadable items are dropped
+    
+    With an executor the keys are computed in parallel; hashlib releases the GIL
+    while digesting, so file hashing scales across the pool's threads.
+    """
+    def safe_key(item):
+        try:
+            return key(item)
+        except OSError:
+            return None
+    
+    keys = executor.map(safe_key, items) if executor else map(safe_key, items)
+    groups = {}
+    for item, item_key in zip(items, keys):
+        if item_key is not None:
+            groups.setdefault(item_key, []).append(item)
+    return groups
+
+
+class DirSnapshot:
+    """One scandir walk of a directory tree, stored as parallel lists
+    
+    Helpers share a snapshot instead of re-listing and re-stat-ing the tree;
+    files they move or delete are marked with discard().
+    """
+    
+    def __init__(self, root, recursive=True):
+        self.root = str(root)
+        self.paths = []
+        self.names = []
+        self.sizes = []
+        self.mtimes = []
+        self.top_level = []
+        self.gone = set()
+        
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    stack.append(entry.path)
+                                continue
+                            if not entry.is_file():
+                                continue
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        self.paths.append(entry.path)
+                        self.names.append(entry.name)
+                        self.sizes.append(st.st_size)
+                        self.mtimes.append(st.st_mtime)
+                        self.top_level.append(directory == self.root)
+            except OSError:
+                continue
+    
+    def indexes(self, top_level_only=False):
+        """Indexes of files still present, optionally only those directly in root"""
+        return [i for i, path in enumerate(self.paths)
+                if path not in self.gone and (not top_level_only or self.top_level[i])]
+    
+    def discard(self, path):
+        """Mark a file as moved or deleted"""
+        self.gone.add(str(path))
+
+
+class DirFds:
+    """Directory fds opened once per batch so renames skip per-file path lookups"""
+    
+    def __init__(self):
+        self.fds = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+    
+    def get(self, directory):
+        """Open (or reuse) an fd for directory"""
+        directory = str(directory) or "."
+        fd = self.fds.get(directory)
+        if fd is None:
+            fd = self.fds[directory] = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        return fd
+    
+    def exists(self, directory, name):
+        """Check whether name exists in directory"""
+        try:
+            os.stat(name, dir_fd=self.get(directory), follow_symlinks=False)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def move(self, src, dest_dir):
+        """Move file src into dest_dir, keeping its name"""
+        src_dir, name = os.path.split(str(src))
+        os.rename(name, name, src_dir_fd=self.get(src_dir), dst_dir_fd=self.get(dest_dir))
+
+
+def bucket_by_kb(indexes, sizes):
+    """Group file indexes by size in whole KB: {bucket: [index, ...]}"""
+    if NUMPY_AVAILABLE and len(indexes) >= VECTORIZE_MIN_FILES:
+        index_array = np.asarray(indexes, dtype=np.int64)
+        buckets = np.asarray(sizes, dtype=np.int64)[index_array] >> 10
+        order = np.argsort(buckets, kind="stable")
+        sorted_buckets = buckets[order]
+        splits = np.flatnonzero(np.diff(sorted_buckets)) + 1
+        return {int(sorted_buckets[group[0]]): index_array[order[group]].tolist()
+                for group in np.split(np.arange(len(order)), splits) if len(group)}
+    
+    groups = {}
+    for i in indexes:
+        groups.setdefault(sizes[i] >> 10, []).append(i)
+    return groups
+
+
+def modified_before(indexes, mtimes, cutoff):
+    """File indexes whose mtime is older than cutoff"""
+    if NUMPY_AVAILABLE and len(indexes) >= VECTORIZE_MIN_FILES:
+        index_array = np.asarray(indexes, dtype=np.int64)
+        old_mask = np.asarray(mtimes, dtype=np.float64)[index_array] < cutoff
+        return index_array[old_mask].tolist()
+    return [i for i in indexes if mtimes[i] < cutoff]
+
+
+def count_entries(path, suffix=None, limit=None):
+    """Count directory entries (optionally by suffix), stopping once limit is exceeded
+    
+    Returns None when the directory does not exist.
+    """
+    count = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if suffix is None or entry.name.endswith(suffix):
+                    count += 1
+                    if limit is not None and count > limit:
+                        break
+    except FileNotFoundError:
+        return None
+    return count
+
+
+if WATCHDOG_AVAILABLE:
+    class FactChangeHandler(FileSystemEventHandler):
+        """Wakes the director when a directory behind a threshold fact changes"""
+        
+        def __init__(self, agent):
+            self.agent = agent
+        
+        # Only events that change a directory's contents; opened and
+        # closed_no_write fire for every reader, the agent's own reads included
+        def on_created(self, event):
+            self.agent.notify_change()
+        
+        def on_deleted(self, event):
+            self.agent.notify_change()
+        
+        def on_moved(self, event):
+            self.agent.notify_change()
+        
+        def on_closed(self, event):
+            self.agent.notify_change()
+
+
 class DirectorAgent:
+    # Inference backs off while facts are stable and snaps back on any change
+    MIN_INFERENCE_INTERVAL = 3
+    MAX_INFERENCE_INTERVAL = 30
+    COORDINATION_INTERVAL = 5
+    
+    # Below this many files optimizing a space costs more than it saves
+    MIN_OPTIMIZE_FILES = 10
+    
+    # Directories counted by update_facts_from_system
+    WATCHED_DIRS = ["/tmp/ecron_tasks", "spaces/u", "spaces/e", "spaces/s"]
+    
     def __init__(self):
         self.running = False
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self.observer = None
+        self.polling = True         # poll facts every cycle unless all dirs are watched
+        self.fs_changed = True      # a watched directory changed since facts were updated
+        self.inference_interval = self.MIN_INFERENCE_INTERVAL
         self.facts = set()
         self.rules = []
-        self.inference_queue = []
+        self.inference_queue = collections.deque()
+        self.inference_set = set()  # conclusions currently queued
         self.decisions = []
         
+        # Indexes for delta-driven inference
+        self.fact_index = {}        # predicate -> set of facts
+        self.rules_by_pred = {}     # predicate -> list of rule indexes
+        self.dirty_preds = set()    # predicates changed since the last inference pass
+        self.proved = set()         # (rule index, supporting facts) instantiations already fired
+        self.threshold_facts = {}  # threshold fact -> last observed truth value
+        self.priority_dirs_ready = False
+        
         # Initialize basic facts and rules
         self.initialize_knowledge_base()
         
     def initialize_knowledge_base(self):
         """Initialize the symbolic knowledge base"""
-        print("🧠 Initializing Director Agent knowledge base...")
+        logger.info("🧠 Initializing Director Agent knowledge base...")
         
         # Basic facts about the system
         self.add_fact("system(wolfcog)")
@@ -43,113 +417,223 @@ class DirectorAgent:
         
     def start(self):
         """Start the director agent"""
-        print("🎬 Starting Director Agent...")
+        logger.info("🎬 Starting Director Agent...")
         self.running = True
+        self._stop_event.clear()
+        self.start_watching()
         
-        # Start inference thread
-        inference_thread = threading.Thread(target=self.inference_loop)
-        inference_thread.daemon = True
-        inference_thread.start()
+        # One scheduler thread drives both the inference and coordination cycles
+        scheduler_thread = threading.Thread(target=self.scheduler_loop)
+        scheduler_thread.daemon = True
+        scheduler_thread.start()
         
-        # Start coordination thread
-        coordination_thread = threading.Thread(target=self.coordination_loop)
-        coordination_thread.daemon = True
-        coordination_thread.start()
+        logger.info("🎯 Director Agent coordinating system logic...")
+    
+    def start_watching(self):
+        """Watch the fact directories for changes, falling back to polling"""
+        if not WATCHDOG_AVAILABLE:
+            logger.warning("⚠️ watchdog not installed, polling fact directories")
+            return
+        
+        observer = Observer()
+        watched = 0
+        handler = FactChangeHandler(self)
+        for directory in self.WATCHED_DIRS:
+            if os.path.isdir(directory):
+                observer.schedule(handler, directory, recursive=False)
+                watched += 1
+        if not watched:
+            return
         
-        print("🎯 Director Agent coordinating system logic...")
+        observer.daemon = True
+        observer.start()
+        self.observer = observer
+        # Directories that do not exist yet still have to be polled
+        self.polling = watched < len(self.WATCHED_DIRS)
+        logger.info("👀 Watching %s fact directories", watched)
+    
+    def notify_change(self):
+        """Called from the observer thread when a watched directory changes"""
+        self.fs_changed = True
+        self._wake_event.set()
     
     def add_fact(self, fact):
         """Add a fact to the knowledge base"""
-        self.facts.add(fact)
-        print(f"📝 Added fact: {fact}")
+        if fact not in self.facts:
+            self.facts.add(fact)
+            predicate = fact.partition("(")[0]
+            self.fact_index.setdefault(predicate, set()).add(fact)
+            self.dirty_preds.add(predicate)
+            logger.debug("📝 Added fact: %s", fact)
     
     def add_rule(self, conditions, conclusion):
         """Add a rule to the knowledge base"""
-        rule = {"conditions": conditions, "conclusion": conclusion}
+        # Conditions are parsed and specialized once here rather than on every match
+        parsed_conditions = [condition.partition("(") for condition in conditions]
+        rule = {"conditions": conditions, "conclusion": conclusion,
+                "parsed_conditions": parsed_conditions,
+                "matcher": make_rule_matcher(conditions, parsed_conditions)}
+        rule_index = len(self.rules)
         self.rules.append(rule)
-        print(f"⚖️ Added rule: {conditions} → {conclusion}")
+        for predicate, _, _ in parsed_conditions:
+            indexed = self.rules_by_pred.setdefault(predicate, [])
+            if rule_index not in indexed:
+                indexed.append(rule_index)
+            # New rules are evaluated on the next pass
+            self.dirty_preds.add(predicate)
+        logger.debug("⚖️ Added rule: %s → %s", conditions, conclusion)
     
-    def inference_loop(self):
-        """Main inference and reasoning loop"""
-        while self.running:
-            try:
-                # Check system state and update facts
+    def scheduler_loop(self):
+        """Run each cycle when its deadline comes up; cycles return their next interval"""
+        now = time.monotonic()
+        # The sequence number breaks deadline ties so callables are never compared
+        schedule = [(now, 0, self.inference_cycle), (now, 1, self.coordination_cycle)]
+        
+        while not self._stop_event.is_set():
+            deadline, seq, cycle = schedule[0]
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                # Woken early by stop() or by a filesystem change
+                if self._wake_event.wait(delay):
+                    self._wake_event.clear()
+                    if self._stop_event.is_set():
+                        break
+                    if self.fs_changed:
+                        # Pull the inference cycle forward to now
+                        now = time.monotonic()
+                        schedule = [(now if c == self.inference_cycle else d, n, c) for d, n, c in schedule]
+                        heapq.heapify(schedule)
+                    continue
+            
+            interval = cycle()
+            heapq.heapreplace(schedule, (time.monotonic() + interval, seq, cycle))
+    
+    def inference_cycle(self):
+        """One inference and reasoning pass; returns seconds until the next one"""
+        try:
+            # Check system state and update facts
+            if self.polling or self.fs_changed:
+                self.fs_changed = False
                 self.update_facts_from_system()
-                
-                # Apply inference rules
-                self.apply_inference_rules()
-                
-                # Process any new inferences
-                self.process_inferences()
-                
-            except Exception as e:
-                print(f"❌ Inference error: {e}")
+            changed = bool(self.dirty_preds)
+            
+            # Apply inference rules
+            self.apply_inference_rules()
             
-            time.sleep(3)  # Inference cycle every 3 seconds
+            # Process any new inferences
+            self.process_inferences()
+            
+        except Exception as e:
+            logger.error("❌ Inference error: %s", e)
+            changed = True
+        
+        if changed:
+            self.inference_interval = self.MIN_INFERENCE_INTERVAL
+        else:
+            self.inference_interval = min(self.inference_interval * 2, self.MAX_INFERENCE_INTERVAL)
+        return self.inference_interval
     
     def update_facts_from_system(self):
         """Update facts based on current system state"""
         # Check task queue status
-        task_path = Path("/tmp/ecron_tasks")
-        if task_path.exists():
-            task_count = len(list(task_path.glob("*.json")))
-            if task_count > 5:
-                self.add_fact("high_load(e)")
-            else:
-                self.remove_fact("high_load(e)")
+        task_count = count_entries("/tmp/ecron_tasks", ".json", limit=5)
+        if task_count is not None:
+            self.set_threshold_fact("high_load(e)", task_count > 5)
         
         # Check memory usage
         for space in ["u", "e", "s"]:
-            space_path = Path(f"spaces/{space}")
-            if space_path.exists():
-                file_count = len(list(space_path.glob("*")))
-                if file_count > 50:
-                    self.add_fact(f"memory_full({space})")
-                else:
-                    self.remove_fact(f"memory_full({space})")
+            file_count = count_entries(f"spaces/{space}", limit=50)
+            if file_count is not None:
+                self.set_threshold_fact(f"memory_full({space})", file_count > 50)
+    
+    def set_threshold_fact(self, fact, holds):
+        """Add or remove a threshold fact only when its truth value changes"""
+        if self.threshold_facts.get(fact) == holds:
+            return
+        self.threshold_facts[fact] = holds
+        if holds:
+            self.add_fact(fact)
+        else:
+            self.remove_fact(fact)
     
     def remove_fact(self, fact):
         """Remove a fact from the knowledge base"""
-        self.facts.discard(fact)
+        if fact in self.facts:
+            self.facts.discard(fact)
+            predicate = fact.partition("(")[0]
+            indexed = self.fact_index.get(predicate)
+            if indexed is not None:
+                indexed.discard(fact)
+                if not indexed:
+                    del self.fact_index[predicate]
+            self.dirty_preds.add(predicate)
     
     def apply_inference_rules(self):
-        """Apply inference rules to derive new conclusions"""
-        for rule in self.rules:
-            if self.can_apply_rule(rule):
-                conclusion = rule["conclusion"]
-                if not self.is_conclusion_known(conclusion):
-                    self.inference_queue.append(conclusion)
-                    print(f"🧩 Inferred: {conclusion}")
+        """Apply inference rules to derive new conclusions
+        
+        Only rules mentioning a predicate that changed since the last pass are
+        re-evaluated; with stable facts this is a no-op. Each firing is tabled in
+        self.proved under the facts that supported it, so a rule fires again only
+        for new supporting evidence, and its entries are dropped once that
+        evidence is retracted.
+        """
+        if not self.dirty_preds:
+            return
+        
+        rule_indexes = set()
+        for predicate in self.dirty_preds:
+            rule_indexes.update(self.rules_by_pred.get(predicate, ()))
+        self.dirty_preds.clear()
+        
+        # Forget instantiations whose supporting facts are gone
+        self.proved = {(rule_index, support) for rule_index, support in self.proved
+                       if rule_index not in rule_indexes or support <= self.facts}
+        
+        for rule_index in sorted(rule_indexes):
+            rule = self.rules[rule_index]
+            support = self.rule_support(rule)
+            if support is None or (rule_index, support) in self.proved:
+                continue
+            
+            self.proved.add((rule_index, support))
+            conclusion = rule["conclusion"]
+            if not self.is_conclusion_known(conclusion):
+                self.inference_queue.append(conclusion)
+                self.inference_set.add(conclusion)
+                logger.info("🧩 Inferred: %s", conclusion)
     
     def can_apply_rule(self, rule):
         """Check if a rule can be applied given current facts"""
-        for condition in rule["conditions"]:
-            if not self.matches_facts(condition):
-                return False
-        return True
+        return self.rule_support(rule) is not None
+    
+    def rule_support(self, rule):
+        """Facts satisfying every condition of a rule, or None if one is unmatched"""
+        return rule["matcher"](self.facts, self.fact_index)
     
-    def matches_facts(self, condition):
-        """Check if a condition matches any known facts"""
+    def matches_facts(self, condition, parsed=None):
+        """Return the facts matching a condition (empty if none)
+        
+        parsed is the condition's precomputed partition("(") when available.
+        """
         if condition in self.facts:
-            return True
+            return (condition,)
         
         # Simple pattern matching for variables (X, Y, etc.)
-        if "(" in condition:
-            predicate = condition.split("(")[0]
-            for fact in self.facts:
-                if fact.startswith(predicate + "("):
-                    return True
-        return False
+        predicate, paren, _ = parsed or condition.partition("(")
+        if not paren:
+            return ()
+        return self.fact_index.get(predicate, ())
     
     def is_conclusion_known(self, conclusion):
         """Check if a conclusion is already known"""
         # Simple check - in practice would need more sophisticated pattern matching
-        return conclusion in self.facts or conclusion in [inf for inf in self.inference_queue]
+        return conclusion in self.facts or conclusion in self.inference_set
     
     def process_inferences(self):
         """Process inferred conclusions and make decisions"""
         while self.inference_queue:
-            inference = self.inference_queue.pop(0)
+            inference = self.inference_queue.popleft()
+            self.inference_set.discard(inference)
             decision = self.make_decision(inference)
             if decision:
                 self.decisions.append(decision)
@@ -172,19 +656,19 @@ class DirectorAgent:
     
     def extract_space(self, inference):
         """Extract space from inference string"""
-        if "(" in inference and ")" in inference:
-            return inference.split("(")[1].split(")")[0]
-        return "unknown"
+        _, _, rest = inference.partition("(")
+        argument, paren, _ = rest.partition(")")
+        return argument if paren else "unknown"
     
     def extract_agent(self, inference):
         """Extract agent from inference string"""
-        if "(" in inference and ")" in inference:
-            return inference.split("(")[1].split(")")[0]
-        return "unknown"
+        _, _, rest = inference.partition("(")
+        argument, paren, _ = rest.partition(")")
+        return argument if paren else "unknown"
     
     def execute_decision(self, decision):
         """Execute a decision"""
-        print(f"⚡ Director executing decision: {decision['type']}")
+        logger.info("⚡ Director executing decision: %s", decision['type'])
         
         if decision["type"] == "optimize_space":
             self.coordinate_space_optimization(decision["space"])
@@ -197,42 +681,49 @@ class DirectorAgent:
     
     def coordinate_space_optimization(self, space):
         """Coordinate space optimization"""
-        print(f"🔧 Coordinating optimization for space: {space}")
+        logger.info("🔧 Coordinating optimization for space: %s", space)
         
         try:
             space_path = Path(f"spaces/{space}")
             if not space_path.exists():
-                print(f"⚠️ Space {space} does not exist")
+                logger.warning("⚠️ Space %s does not exist", space)
                 return
             
-            # Analyze space efficiency
-            files = list(space_path.glob("*"))
-            file_sizes = [f.stat().st_size for f in files if f.is_file()]
+            # Analyze space efficiency from a single walk shared by all helpers
+            snapshot = DirSnapshot(space_path)
+            file_count = len(snapshot.indexes())
             
-            if not file_sizes:
-                print(f"📁 Space {space} is empty, no optimization needed")
+            if not file_count:
+                logger.info("📁 Space %s is empty, no optimization needed", space)
+                return
+            if file_count < self.MIN_OPTIMIZE_FILES:
+                logger.info("📁 Space %s has only %s files, no optimization needed", space, file_count)
                 return
             
-            avg_size = sum(file_sizes) / len(file_sizes)
-            small_files = [f for f in files if f.is_file() and f.stat().st_size < avg_size * 0.1]
+            top_level = snapshot.indexes(top_level_only=True)
+            file_sizes = [snapshot.sizes[i] for i in top_level]
+            small_files = []
+            if file_sizes:
+                small_limit = sum(file_sizes) / len(file_sizes) * 0.1
+                small_files = [snapshot.paths[i] for i in top_level if snapshot.sizes[i] < small_limit]
             
             # Optimization strategies
             if len(small_files) > 10:
-                print(f"🗂️ Consolidating {len(small_files)} small files in space {space}")
-                self.consolidate_small_files(space, small_files)
+                logger.info("🗂️ Consolidating %s small files in space %s", len(small_files), space)
+                self.consolidate_small_files(space, small_files, snapshot)
             
             # Check for duplicate content
-            self.deduplicate_space_content(space_path)
+            self.deduplicate_space_content(space_path, snapshot)
             
             # Organize by semantic similarity (simplified)
-            self.organize_by_pattern(space_path)
+            self.organize_by_pattern(space_path, snapshot)
             
-            print(f"✅ Space {space} optimization completed")
+            logger.info("✅ Space %s optimization completed", space)
             
         except Exception as e:
-            print(f"❌ Space optimization error: {e}")
+            logger.error("❌ Space optimization error: %s", e)
     
-    def consolidate_small_files(self, space, small_files):
+    def consolidate_small_files(self, space, small_files, snapshot=None):
         """Consolidate small files into larger chunks"""
         consolidated_dir = Path(f"spaces/{space}/consolidated")
         consolidated_dir.mkdir(exist_ok=True)
@@ -242,115 +733,198 @@ class DirectorAgent:
             batch = small_files[i:i+batch_size]
             consolidated_file = consolidated_dir / f"batch_{i//batch_size}.txt"
             
-            with open(consolidated_file, 'w') as outfile:
+            with open(consolidated_file, 'wb', buffering=0) as outfile:
                 for file_path in batch:
-                    if file_path.is_file():
-                        outfile.write(f"=== {file_path.name} ===\n")
-                        try:
-                            with open(file_path, 'r') as infile:
-                                outfile.write(infile.read())
-                        except:
-                            outfile.write(f"[Binary file: {file_path.name}]\n")
-                        outfile.write("\n\n")
-                        
-                        # Remove original file
-                        file_path.unlink()
-        
-        print(f"📦 Consolidated {len(small_files)} files into {len(range(0, len(small_files), batch_size))} batches")
-    
-    def deduplicate_space_content(self, space_path):
-        """Remove duplicate files based on content hash"""
-        file_hashes = {}
+                    file_path = Path(file_path)
+                    try:
+                        infile = open(file_path, 'rb')
+                    except OSError:
+                        continue
+                    with infile:
+                        outfile.write(b"=== %s ===\n" % file_path.name.encode())
+                        append_file(outfile, infile)
+                        outfile.write(b"\n\n")
+                    
+                    # Remove original file
+                    file_path.unlink()
+                    if snapshot is not None:
+                        snapshot.discard(file_path)
+        
+        logger.info("📦 Consolidated %s files into %s batches",
+                    len(small_files), math.ceil(len(small_files) / batch_size))
+    
+    def deduplicate_space_content(self, space_path, snapshot=None):
+        """Remove duplicate files based on content hash
+        
+        Files are grouped by size first, so only size collisions are read; those
+        are compared on a prefix hash before the full content is hashed.
+        """
         duplicates = []
+        if snapshot is None:
+            snapshot = DirSnapshot(space_path)
         
-        for file_path in space_path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    with open(file_path, 'rb') as f:
-                        file_hash = hashlib.md5(f.read()).hexdigest()
+        size_groups = {}
+        for i in snapshot.indexes():
+            size_groups.setdefault(snapshot.sizes[i], []).append(snapshot.paths[i])
+        
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            for size, same_size in size_groups.items():
+                if len(same_size) < 2:
+                    continue
+                
+                prefix_groups = group_by(same_size, lambda p: hash_file(p, DEDUP_PREFIX_SIZE), executor)
+                for same_prefix in prefix_groups.values():
+                    if len(same_prefix) < 2:
+                        continue
                     
-                    if file_hash in file_hashes:
-                        duplicates.append(file_path)
+                    if size <= DEDUP_PREFIX_SIZE:
+                        content_groups = [same_prefix]
                     else:
-                        file_hashes[file_hash] = file_path
-                except:
-                    continue
+                        content_groups = group_by(same_prefix, hash_file, executor).values()
+                    
+                    # Keep the first file of each identical group
+                    for same_content in content_groups:
+                        duplicates.extend(same_content[1:])
         
         for dup_file in duplicates:
-            dup_file.unlink()
-            print(f"🗑️ Removed duplicate: {dup_file}")
+            os.unlink(dup_file)
+            snapshot.discard(dup_file)
+            logger.debug("🗑️ Removed duplicate: %s", dup_file)
         
         if duplicates:
-            print(f"✨ Removed {len(duplicates)} duplicate files")
+            logger.info("✨ Removed %s duplicate files", len(duplicates))
+        
+        if DATASKETCH_AVAILABLE:
+            self.remove_near_duplicates(snapshot)
     
-    def organize_by_pattern(self, space_path):
+    def remove_near_duplicates(self, snapshot):
+        """Move aside files whose shingle sets are near-identical to an earlier file
+        
+        Only files with a neighbour of similar size are sketched, since files whose
+        sizes differ by more than the threshold cannot reach it. LSH candidates are
+        confirmed on their estimated Jaccard similarity before a file is moved.
+        """
+        near_dup_dir = os.path.join(snapshot.root, NEAR_DUP_DIR)
+        by_size = sorted((snapshot.sizes[i], i) for i in snapshot.indexes()
+                         if NEAR_DUP_MIN_SIZE <= snapshot.sizes[i] <= NEAR_DUP_MAX_SIZE
+                         and os.path.dirname(snapshot.paths[i]) != near_dup_dir)
+        candidates = set()
+        for (size_a, a), (size_b, b) in zip(by_size, by_size[1:]):
+            if size_a >= size_b * NEAR_DUP_THRESHOLD:
+                candidates.update((a, b))
+        if not candidates:
+            return
+        
+        lsh = MinHashLSH(threshold=NEAR_DUP_THRESHOLD, num_perm=NEAR_DUP_PERMUTATIONS)
+        sketches = {}
+        moved = 0
+        with DirFds() as dir_fds:
+            # Encounter order, so the earliest file of each similar group is kept
+            for i in sorted(candidates):
+                path = snapshot.paths[i]
+                try:
+                    sketch = minhash_file(path)
+                except OSError:
+                    continue
+                
+                # LSH banding also yields pairs well below the threshold
+                if not any(sketch.jaccard(sketches[key]) >= NEAR_DUP_THRESHOLD for key in lsh.query(sketch)):
+                    lsh.insert(path, sketch)
+                    sketches[path] = sketch
+                    continue
+                
+                os.makedirs(near_dup_dir, exist_ok=True)
+                if dir_fds.exists(near_dup_dir, snapshot.names[i]):
+                    continue
+                dir_fds.move(path, near_dup_dir)
+                snapshot.discard(path)
+                moved += 1
+                logger.debug("🗑️ Moved near-duplicate: %s", path)
+        
+        if moved:
+            logger.info("✨ Moved %s near-duplicate files to %s", moved, near_dup_dir)
+    
+    def organize_by_pattern(self, space_path, snapshot=None):
         """Organize files by naming patterns and content types"""
-        patterns = {
-            'symbolic': r'.*[∇∂⊗Φ].*',
-            'numeric': r'.*\d+.*',
-            'temporal': r'.*time.*|.*[0-9]{4}[0-9]{2}[0-9]{2}.*',
-            'config': r'.*\.json$|.*\.yaml$|.*\.conf$'
-        }
+        if snapshot is None:
+            snapshot = DirSnapshot(space_path, recursive=False)
         
-        import re
+        categories = {}
+        for i in snapshot.indexes(top_level_only=True):
+            match = FILE_PATTERN_RE.match(snapshot.names[i])
+            if match:
+                categories.setdefault(match.lastgroup, []).append(i)
         
-        for pattern_name, pattern_regex in patterns.items():
+        for pattern_name, matching_files in categories.items():
             pattern_dir = space_path / pattern_name
             
-            matching_files = []
-            for file_path in space_path.glob("*"):
-                if file_path.is_file() and re.match(pattern_regex, file_path.name):
-                    matching_files.append(file_path)
-            
             if matching_files:
                 pattern_dir.mkdir(exist_ok=True)
-                for file_path in matching_files:
-                    dest_path = pattern_dir / file_path.name
-                    if not dest_path.exists():
-                        file_path.rename(dest_path)
+                with DirFds() as dir_fds:
+                    for i in matching_files:
+                        if not dir_fds.exists(pattern_dir, snapshot.names[i]):
+                            dir_fds.move(snapshot.paths[i], pattern_dir)
+                            snapshot.discard(snapshot.paths[i])
                 
-                print(f"📂 Organized {len(matching_files)} files into {pattern_name} category")
+                logger.info("📂 Organized %s files into %s category", len(matching_files), pattern_name)
     
     def coordinate_task_redistribution(self, agent):
         """Coordinate task redistribution"""
-        print(f"🔄 Coordinating task redistribution for agent: {agent}")
+        logger.info("🔄 Coordinating task redistribution for agent: %s", agent)
         
         try:
             # Assess current task load
             task_path = Path("/tmp/ecron_tasks")
             if not task_path.exists():
-                print("📁 No task queue found")
+                logger.info("📁 No task queue found")
                 return
             
             pending_tasks = list(task_path.glob("*.json"))
             
             if len(pending_tasks) <= 5:
-                print("⚖️ Task load is manageable, no redistribution needed")
+                logger.info("⚖️ Task load is manageable, no redistribution needed")
                 return
             
-            print(f"📊 Found {len(pending_tasks)} pending tasks, redistributing...")
+            logger.info("📊 Found %s pending tasks, redistributing...", len(pending_tasks))
             
             # Categorize tasks by priority and space
             task_categories = {'u': [], 'e': [], 's': [], 'unknown': []}
             
             for task_file in pending_tasks:
-                try:
-                    with open(task_file, 'r') as f:
-                        task_data = json.load(f)
-                    
-                    space = task_data.get('space', 'unknown')
-                    if space in task_categories:
-                        task_categories[space].append(task_file)
-                    else:
-                        task_categories['unknown'].append(task_file)
-                except:
+                space = self.read_task_space(task_file)
+                if space in task_categories:
+                    task_categories[space].append(task_file)
+                else:
                     task_categories['unknown'].append(task_file)
             
             # Redistribute based on load balancing
             self.redistribute_by_priority(task_categories)
             
         except Exception as e:
-            print(f"❌ Task redistribution error: {e}")
+            logger.error("❌ Task redistribution error: %s", e)
+    
+    def read_task_space(self, task_file):
+        """Space named by a task file, or 'unknown'
+        
+        The first TASK_HEAD_SIZE bytes are scanned for the space key; the file is
+        only parsed in full when that misses.
+        """
+        try:
+            with open(task_file, 'rb') as f:
+                head = f.read(TASK_HEAD_SIZE)
+                match = TASK_SPACE_RE.search(head)
+                if match:
+                    # Trusted only when nothing before it can open a nested value:
+                    # just the top-level brace, no other brace or bracket
+                    prefix = head[:match.start()]
+                    if prefix.count(b"{") == 1 and b"}" not in prefix and b"[" not in prefix:
+                        return match.group(1).decode()
+                task_data = json_loads(head + f.read())
+        except (OSError, ValueError):
+            return 'unknown'
+        
+        space = task_data.get('space', 'unknown') if isinstance(task_data, dict) else 'unknown'
+        return space if isinstance(space, str) else 'unknown'
     
     def redistribute_by_priority(self, task_categories):
         """Redistribute tasks based on priority and load balancing"""
@@ -361,97 +935,85 @@ class DirectorAgent:
             'low_priority': Path("/tmp/ecron_tasks/low_priority")
         }
         
-        for dir_path in priority_dirs.values():
-            dir_path.mkdir(exist_ok=True)
+        if not self.priority_dirs_ready:
+            for dir_path in priority_dirs.values():
+                dir_path.mkdir(exist_ok=True)
+            self.priority_dirs_ready = True
         
-        # Redistribute system tasks to high priority
-        for task_file in task_categories['s']:
-            dest = priority_dirs['high_priority'] / task_file.name
-            task_file.rename(dest)
+        # System tasks -> high, execution -> medium, user and unknown -> low
+        destinations = [
+            ('s', priority_dirs['high_priority']),
+            ('e', priority_dirs['medium_priority']),
+            ('u', priority_dirs['low_priority']),
+            ('unknown', priority_dirs['low_priority'])
+        ]
         
-        # Redistribute execution tasks to medium priority
-        for task_file in task_categories['e']:
-            dest = priority_dirs['medium_priority'] / task_file.name
-            task_file.rename(dest)
+        with DirFds() as dir_fds:
+            for category, dest_dir in destinations:
+                for task_file in task_categories[category]:
+                    dir_fds.move(task_file, dest_dir)
         
-        # Redistribute user tasks to low priority
-        for task_file in task_categories['u']:
-            dest = priority_dirs['low_priority'] / task_file.name
-            task_file.rename(dest)
-        
-        # Handle unknown tasks
-        for task_file in task_categories['unknown']:
-            dest = priority_dirs['low_priority'] / task_file.name
-            task_file.rename(dest)
-        
-        print(f"📋 Redistributed tasks: {len(task_categories['s'])} high, {len(task_categories['e'])} medium, {len(task_categories['u'])} low priority")
+        logger.info("📋 Redistributed tasks: %s high, %s medium, %s low priority",
+                    len(task_categories['s']), len(task_categories['e']), len(task_categories['u']))
     
     def coordinate_memory_compression(self, space):
         """Coordinate memory compression"""
-        print(f"🗜️ Coordinating memory compression for space: {space}")
+        logger.info("🗜️ Coordinating memory compression for space: %s", space)
         
         try:
             space_path = Path(f"spaces/{space}")
             if not space_path.exists():
-                print(f"⚠️ Space {space} does not exist")
+                logger.warning("⚠️ Space %s does not exist", space)
                 return
             
-            # Analyze memory usage
-            total_files = list(space_path.rglob("*"))
-            file_count = len([f for f in total_files if f.is_file()])
+            # Analyze memory usage from a single walk shared by all strategies
+            snapshot = DirSnapshot(space_path)
+            file_count = len(snapshot.indexes())
             
             if file_count < 50:
-                print(f"📊 Space {space} has {file_count} files, compression not needed")
+                logger.info("📊 Space %s has %s files, compression not needed", space, file_count)
                 return
             
-            print(f"🗜️ Compressing {file_count} files in space {space}")
+            logger.info("🗜️ Compressing %s files in space %s", file_count, space)
             
             # Implement compression strategies
-            self.compress_by_age(space_path)
-            self.compress_by_similarity(space_path)
-            self.archive_old_content(space_path)
+            self.compress_by_age(space_path, snapshot)
+            self.compress_by_similarity(space_path, snapshot)
+            self.archive_old_content(space_path, snapshot)
             
-            print(f"✅ Memory compression completed for space {space}")
+            logger.info("✅ Memory compression completed for space %s", space)
             
         except Exception as e:
-            print(f"❌ Memory compression error: {e}")
+            logger.error("❌ Memory compression error: %s", e)
     
-    def compress_by_age(self, space_path):
+    def compress_by_age(self, space_path, snapshot=None):
         """Compress files by age"""
-        import time
         current_time = time.time()
         old_threshold = 7 * 24 * 3600  # 7 days
+        if snapshot is None:
+            snapshot = DirSnapshot(space_path)
         
-        old_files = []
-        for file_path in space_path.rglob("*"):
-            if file_path.is_file():
-                age = current_time - file_path.stat().st_mtime
-                if age > old_threshold:
-                    old_files.append(file_path)
+        old_files = modified_before(snapshot.indexes(), snapshot.mtimes,
+                                    current_time - old_threshold)
         
         if old_files:
             archive_dir = space_path / "archived"
             archive_dir.mkdir(exist_ok=True)
             
-            for old_file in old_files:
-                archive_path = archive_dir / old_file.name
-                old_file.rename(archive_path)
+            with DirFds() as dir_fds:
+                for i in old_files:
+                    dir_fds.move(snapshot.paths[i], archive_dir)
+                    snapshot.discard(snapshot.paths[i])
             
-            print(f"📦 Archived {len(old_files)} old files")
+            logger.info("📦 Archived %s old files", len(old_files))
     
-    def compress_by_similarity(self, space_path):
+    def compress_by_similarity(self, space_path, snapshot=None):
         """Compress similar files together"""
-        # Group files by size similarity (simple heuristic)
-        size_groups = {}
+        if snapshot is None:
+            snapshot = DirSnapshot(space_path, recursive=False)
         
-        for file_path in space_path.glob("*"):
-            if file_path.is_file():
-                size = file_path.stat().st_size
-                size_bucket = size // 1024  # Group by KB
-                
-                if size_bucket not in size_groups:
-                    size_groups[size_bucket] = []
-                size_groups[size_bucket].append(file_path)
+        # Group files by size similarity (simple heuristic, by KB)
+        size_groups = bucket_by_kb(snapshot.indexes(top_level_only=True), snapshot.sizes)
         
         # Compress groups with many similar-sized files
         for size_bucket, files in size_groups.items():
@@ -459,60 +1021,56 @@ class DirectorAgent:
                 similar_dir = space_path / f"similar_size_{size_bucket}kb"
                 similar_dir.mkdir(exist_ok=True)
                 
-                for file_path in files:
-                    dest_path = similar_dir / file_path.name
-                    if not dest_path.exists():
-                        file_path.rename(dest_path)
+                with DirFds() as dir_fds:
+                    for i in files:
+                        if not dir_fds.exists(similar_dir, snapshot.names[i]):
+                            dir_fds.move(snapshot.paths[i], similar_dir)
+                            snapshot.discard(snapshot.paths[i])
                 
-                print(f"📂 Grouped {len(files)} similar files (~{size_bucket}KB each)")
+                logger.info("📂 Grouped %s similar files (~%sKB each)", len(files), size_bucket)
     
-    def archive_old_content(self, space_path):
+    def archive_old_content(self, space_path, snapshot=None):
         """Archive old content to reduce active memory"""
         archive_path = space_path / "archive"
         archive_path.mkdir(exist_ok=True)
+        if snapshot is None:
+            snapshot = DirSnapshot(space_path, recursive=False)
         
         # Move files older than 30 days to archive
-        import time
         current_time = time.time()
         archive_threshold = 30 * 24 * 3600  # 30 days
         
         archived_count = 0
-        for file_path in space_path.glob("*"):
-            if file_path.is_file():
-                age = current_time - file_path.stat().st_mtime
-                if age > archive_threshold:
-                    archive_file = archive_path / file_path.name
-                    if not archive_file.exists():
-                        file_path.rename(archive_file)
-                        archived_count += 1
+        old_files = modified_before(snapshot.indexes(top_level_only=True), snapshot.mtimes,
+                                    current_time - archive_threshold)
+        with DirFds() as dir_fds:
+            for i in old_files:
+                if not dir_fds.exists(archive_path, snapshot.names[i]):
+                    dir_fds.move(snapshot.paths[i], archive_path)
+                    snapshot.discard(snapshot.paths[i])
+                    archived_count += 1
         
         if archived_count > 0:
-            print(f"🗃️ Archived {archived_count} old files")
-    
-    def coordinate_memory_compression(self, space):
-        """Coordinate memory compression"""
-        print(f"🗜️ Coordinating memory compression for space: {space}")
-        # Previous implementation moved up
+            logger.info("🗃️ Archived %s old files", archived_count)
     
     def coordinate_task_processing(self):
         """Coordinate task processing"""
-        print("📋 Coordinating task processing")
+        logger.info("📋 Coordinating task processing")
         # Placeholder for task coordination
     
-    def coordination_loop(self):
-        """Main coordination loop"""
-        while self.running:
-            try:
-                # Monitor other agents and coordinate
-                self.check_agent_status()
-                
-                # Coordinate system-wide activities
-                self.coordinate_system_activities()
-                
-            except Exception as e:
-                print(f"❌ Coordination error: {e}")
+    def coordination_cycle(self):
+        """One coordination pass; returns seconds until the next one"""
+        try:
+            # Monitor other agents and coordinate
+            self.check_agent_status()
+            
+            # Coordinate system-wide activities
+            self.coordinate_system_activities()
             
-            time.sleep(5)  # Coordination cycle every 5 seconds
+        except Exception as e:
+            logger.error("❌ Coordination error: %s", e)
+        
+        return self.COORDINATION_INTERVAL
     
     def check_agent_status(self):
         """Check status of other agents"""
@@ -528,14 +1086,21 @@ class DirectorAgent:
         """Get current knowledge base state"""
         return {
             "facts": list(self.facts),
-            "rules": self.rules,
+            "rules": [{"conditions": rule["conditions"], "conclusion": rule["conclusion"]}
+                      for rule in self.rules],
             "recent_decisions": self.decisions[-10:]  # Last 10 decisions
         }
     
     def stop(self):
         """Stop the director agent"""
-        print("🛑 Stopping Director Agent...")
+        logger.info("🛑 Stopping Director Agent...")
         self.running = False
+        self._stop_event.set()
+        self._wake_event.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
 
 if __name__ == "__main__":
     agent = DirectorAgent()
@@ -546,4 +1111,4 @@ if __name__ == "__main__":
             time.sleep(1)
     except KeyboardInterrupt:
         agent.stop()
-        print("👋 Director Agent stopped.")
\ No newline at end of file
+        logger.info("👋 Director Agent stopped.")
@@ -6,21 +6,135 @@ Provides real-time monitoring of WolfCog AGI-OS system state
 
 import time
 import json
-import subprocess
+import heapq
 import threading
 import os
-import glob
+import re
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# Prefer orjson for writing the dashboard file when installed
+try:
+    import orjson
+    
+    def json_dump(obj, f):
+        """Write obj compactly to the binary file f"""
+        f.write(orjson.dumps(obj))
+except ImportError:
+    JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+    
+    def json_dump(obj, f):
+        """Write obj compactly to the binary file f, chunk by chunk"""
+        # Streams through f's buffer instead of building the whole document first
+        for chunk in JSON_ENCODER.iterencode(obj):
+            f.write(chunk.encode())
+
+JSON_WRITE_BUFFER = 1 << 16
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+BANNER = "=" * 60
+
+# System-wide procfs files read every tick; their descriptors stay open and are
+# re-read from offset 0, which regenerates the contents
+PROCFS_FILES = {
+    "loadavg": "/proc/loadavg",
+    "meminfo": "/proc/meminfo",
+    "stat": "/proc/stat",
+    "uptime": "/proc/uptime",
+    "net_dev": "/proc/net/dev"
+}
+PROCFS_READ_SIZE = 4096
+
+# Aggregate "cpu" line at the top of /proc/stat; its fields fit in the first read
+CPU_STAT_RE = re.compile(rb'cpu +(\d+(?: \d+)*)')
+CPU_STAT_READ_SIZE = 256
+
+# One /proc/net/dev interface line: name, then 8 receive and 8 transmit counters
+NET_DEV_RE = re.compile(rb'^ *([^\s:]+): *(\d+)' + rb' +(\d+)' * 15, re.M)
+
+# The /proc/meminfo fields used by get_memory_usage, matched in one scan
+MEMINFO_RE = re.compile(rb'^(MemTotal|MemFree|MemAvailable|Buffers|Cached):\s+(\d+)', re.M)
+
 class SymbolicStateDashboard:
+    AGENT_SCRIPTS = ("admin_agent.py", "director_agent.py", "ecron-scheduler.py",
+                     "reflex-monitor.py", "symbolic-state-dashboard.py")
+    SPACES = ("u", "e", "s")
+    RECENT_WINDOW = 300  # seconds a file counts as a recent mutation
+    # Plain strings are handed straight to os.scandir / os.path
+    SPACE_PATHS = {space: f"spaces/{space}" for space in SPACES}
+    
     def __init__(self):
         self.running = False
-        self.metrics = {}
+        self._stop_event = threading.Event()
+        # Allocated once; collect_system_metrics refreshes the slots in place
+        self.metrics = {
+            "timestamp": None,
+            "spaces": {},
+            "tasks": {},
+            "agents": {},
+            "shell": {},
+            "memory_topology": {},
+            "recent_mutations": [],
+            "system_performance": {},
+            "uptime": 0
+        }
         self.update_interval = 5  # seconds
         self.dashboard_file = "/tmp/wolfcog_visualizations/live-dashboard.json"
+        self._proc_snapshot = None  # pid -> process info, refreshed once per tick
+        self._script_to_pid = None  # agent script -> pid, derived from the snapshot
+        self._prev_proc_times = {}  # pid -> cpu ticks at the previous tick
+        self._prev_proc_wall = None
+        self._space_scan = {}  # space -> one walk of spaces/<space>, refreshed once per tick
+        self._dir_cache = {}  # space -> {directory: (st_mtime_ns, reusable, entries, subdirs, files)}
+        # Independent procfs/statvfs reads of a tick overlap on this pool
+        self.io_pool = ThreadPoolExecutor(max_workers=4)
+        self._procfs_fds = self.open_procfs_files()
         self.ensure_directories()
         
+    def open_procfs_files(self):
+        """Open each PROCFS_FILES entry once; missing files are left out"""
+        fds = {}
+        for name, path in PROCFS_FILES.items():
+            try:
+                fds[name] = os.open(path, os.O_RDONLY)
+            except OSError:
+                pass
+        return fds
+    
+    def close_procfs_files(self):
+        """Close the descriptors opened by open_procfs_files"""
+        fds, self._procfs_fds = self._procfs_fds, {}
+        for fd in fds.values():
+            os.close(fd)
+    
+    def read_procfs(self, name, size=None):
+        """Current contents of a PROCFS_FILES entry through its open descriptor
+        
+        pread from offset 0 re-generates the file without a seek, and leaves no
+        shared offset for concurrent readers to race on. With size, only that
+        many leading bytes are read. Raises OSError if the file is unavailable.
+        """
+        fd = self._procfs_fds.get(name)
+        if fd is None:
+            raise OSError(f"{PROCFS_FILES[name]} is not available")
+        if size is not None:
+            return os.pread(fd, size, 0)
+        
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, PROCFS_READ_SIZE, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b"".join(chunks)
+    
     def ensure_directories(self):
         """Ensure required directories exist"""
         Path("/tmp/wolfcog_visualizations").mkdir(exist_ok=True)
@@ -29,26 +143,38 @@ class SymbolicStateDashboard:
         """Collect comprehensive system metrics"""
         timestamp = datetime.now().isoformat()
         
+        # Start the system reads in the background while the spaces are walked here
+        pool = self.io_pool
+        load_future = pool.submit(self.get_load_average)
+        memory_future = pool.submit(self.get_memory_usage)
+        cpu_future = pool.submit(self.get_cpu_usage)
+        disk_future = pool.submit(self.get_disk_usage)
+        network_future = pool.submit(self.get_network_stats)
+        uptime_future = pool.submit(self.get_system_uptime)
+        proc_future = pool.submit(self.scan_processes)
+        
+        # Likewise one walk per space serves the space, topology and mutation stats
+        self._space_scan = {space: self.scan_space(space) for space in self.SPACES}
+        
         # Collect space statistics
         spaces = {}
-        for space in ["u", "e", "s"]:
-            space_path = Path(f"spaces/{space}")
-            file_count = len(list(space_path.glob("*"))) if space_path.exists() else 0
+        for space in self.SPACES:
+            scan = self.get_space_scan(space)
+            file_count = scan["entries"] if scan else 0
             
             spaces[space] = {
                 "files": file_count,
                 "activity": "active" if file_count > 0 else "idle",
                 "memory_usage": self.get_space_memory_usage(space),
-                "last_modified": self.get_last_modified_time(space_path)
+                "last_modified": self.get_last_modified_time(space)
             }
         
         # Collect task queue statistics  
-        task_dir = Path("/tmp/ecron_tasks")
-        task_stats = {
-            "pending": len(list(task_dir.glob("*.json"))) if task_dir.exists() else 0,
-            "processed": len(list(task_dir.glob("*.processed"))) if task_dir.exists() else 0,
-            "failed": len(list(task_dir.glob("*.failed"))) if task_dir.exists() else 0
-        }
+        task_stats = self.count_tasks("/tmp/ecron_tasks")
+        
+        # One /proc walk per tick serves every process query below
+        self._proc_snapshot = proc_future.result()
+        self._script_to_pid = None
         
         # Collect agent statistics
         agent_stats = self.collect_agent_statistics()
@@ -63,131 +189,283 @@ class SymbolicStateDashboard:
         recent_mutations = self.collect_recent_mutations()
         
         # System performance metrics (comprehensive)
+        memory_usage = memory_future.result()
+        uptime = uptime_future.result()
         system_perf = {
-            "load_average": self.get_load_average(),
+            "load_average": load_future.result(),
             "process_count": self.get_process_count(),
-            "memory_usage": self.get_memory_usage(),
-            "cpu_usage": self.get_cpu_usage(),
-            "disk_usage": self.get_disk_usage(),
-            "network_stats": self.get_network_stats(),
-            "wolfcog_processes": self.get_wolfcog_process_stats(),
-            "uptime": self.get_system_uptime()
-        }
-        
-        metrics = {
-            "timestamp": timestamp,
-            "spaces": spaces,
-            "tasks": task_stats,
-            "agents": agent_stats,
-            "shell": shell_info,
-            "memory_topology": memory_topology,
-            "recent_mutations": recent_mutations,
-            "system_performance": system_perf,
-            "uptime": self.get_system_uptime()
+            "memory_usage": memory_usage,
+            "cpu_usage": cpu_future.result(),
+            "disk_usage": disk_future.result(),
+            "network_stats": network_future.result(),
+            "wolfcog_processes": self.get_wolfcog_process_stats(memory_usage["total"], uptime),
+            "uptime": uptime
         }
         
-        self.metrics = metrics
+        metrics = self.metrics
+        for slot, value in (("spaces", spaces), ("tasks", task_stats), ("agents", agent_stats),
+                            ("shell", shell_info), ("memory_topology", memory_topology),
+                            ("system_performance", system_perf)):
+            metrics[slot].clear()
+            metrics[slot].update(value)
+        metrics["recent_mutations"].clear()
+        metrics["recent_mutations"].extend(recent_mutations)
+        metrics["uptime"] = uptime
+        # Set last, so a filled-in timestamp means the slots are complete
+        metrics["timestamp"] = timestamp
         return metrics
         
-    def get_space_memory_usage(self, space):
-        """Get memory usage for a specific space"""
-        space_path = Path(f"spaces/{space}")
-        if not space_path.exists():
-            return 0
-            
+    def scan_space(self, space):
+        """Walk spaces/<space> once with os.scandir, aggregating as it goes
+        
+        Returns {"entries": number of top-level entries, "total_size" over every
+        file in the tree, "latest_mtime" over every file and directory (so removals
+        and renames count as modifications), "recent": [(mtime, path), ...] for
+        files modified within RECENT_WINDOW}, or None if the space is missing.
+        """
+        root = self.SPACE_PATHS[space]
+        if not os.path.isdir(root):
+            self._dir_cache.pop(space, None)
+            return None
+        
+        cutoff = time.time() - self.RECENT_WINDOW
+        old_cache = self._dir_cache.get(space, {})
+        new_cache = {}
+        entries = 0
         total_size = 0
-        for file_path in space_path.rglob("*"):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-        return total_size
-        
-    def get_last_modified_time(self, path):
-        """Get last modified time for a path"""
-        if not path.exists():
+        latest_mtime = 0
+        recent = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            listing = self.list_directory(directory, old_cache)
+            if listing is None:
+                continue
+            new_cache[directory] = listing
+            dir_mtime_ns, _, dir_entries, subdirs, files = listing
+            latest_mtime = max(latest_mtime, dir_mtime_ns / 1e9)
+            if directory == root:
+                entries = dir_entries
+            stack.extend(subdirs)
+            
+            # File contents change without touching the directory, so files are
+            # still stat-ed every tick; only the readdir is cached
+            for path in files:
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    continue
+                mtime = st.st_mtime
+                total_size += st.st_size
+                if mtime > latest_mtime:
+                    latest_mtime = mtime
+                if mtime > cutoff:
+                    recent.append((mtime, path))
+        
+        # Directories no longer in the tree drop out of the cache
+        self._dir_cache[space] = new_cache
+        return {"entries": entries, "total_size": total_size,
+                "latest_mtime": latest_mtime, "recent": recent}
+    
+    def list_directory(self, directory, cache):
+        """(st_mtime_ns, reusable, entry count, subdirectories, files) of a directory
+        
+        The listing in cache is reused while the directory's mtime is unchanged,
+        since creating, deleting or renaming an entry always bumps it.
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        cached = cache.get(directory)
+        if cached is not None and cached[1] and cached[0] == mtime_ns:
+            return cached
+        
+        entries = 0
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    entries += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        
+        # A change within the same timestamp tick would not move the mtime, so a
+        # listing taken right after a change is not trusted next time
+        reusable = time.time_ns() - mtime_ns >= 1_000_000_000
+        return (mtime_ns, reusable, entries, subdirs, files)
+    
+    def get_space_scan(self, space):
+        """Walk of a space for the current tick, scanning it if not yet done"""
+        if space not in self._space_scan:
+            self._space_scan[space] = self.scan_space(space)
+        return self._space_scan[space]
+    
+    def count_tasks(self, task_dir):
+        """Tally pending, processed and failed task files in one directory pass"""
+        pending = processed = failed = 0
+        try:
+            with os.scandir(task_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.endswith(".json"):
+                        pending += 1
+                    elif name.endswith(".processed"):
+                        processed += 1
+                    elif name.endswith(".failed"):
+                        failed += 1
+        except OSError:
+            pass
+        return {"pending": pending, "processed": processed, "failed": failed}
+    
+    def get_space_memory_usage(self, space):
+        """Get memory usage for a specific space
+        
+        Sizes are summed while the tick's walk stats each file, so this is a lookup.
+        """
+        scan = self.get_space_scan(space)
+        return scan["total_size"] if scan else 0
+        
+    def get_last_modified_time(self, space):
+        """Get last modified time for a space
+        
+        Taken from the tick's walk, so no extra traversal or stat is needed.
+        """
+        scan = self.get_space_scan(space)
+        if not scan:
             return None
             
-        latest_time = 0
-        for item in path.rglob("*"):
-            if item.is_file():
-                latest_time = max(latest_time, item.stat().st_mtime)
-                
+        latest_time = scan["latest_mtime"]
         return datetime.fromtimestamp(latest_time).isoformat() if latest_time > 0 else None
         
     def get_load_average(self):
         """Get system load average (Linux only)"""
         try:
-            with open('/proc/loadavg', 'r') as f:
-                load_avg = f.read().split()
-                return {
-                    "1min": float(load_avg[0]),
-                    "5min": float(load_avg[1]),
-                    "15min": float(load_avg[2]),
-                    "processes": load_avg[3]  # running/total processes
-                }
+            load_avg = self.read_procfs("loadavg").split()
+            return {
+                "1min": float(load_avg[0]),
+                "5min": float(load_avg[1]),
+                "15min": float(load_avg[2]),
+                "processes": load_avg[3].decode()  # running/total processes
+            }
         except:
             return {"1min": 0.0, "5min": 0.0, "15min": 0.0, "processes": "0/0"}
             
+    def scan_processes(self):
+        """Read cmdline and stat of every process from /proc
+        
+        Returns {pid: {"cmdline", "names", "comm", "rss", "cpu_time", "start_time"}}
+        with rss in pages and times in clock ticks. names holds the basenames of
+        argv[0] and of the first non-option argument (the script run by an
+        interpreter), for exact matching.
+        """
+        processes = {}
+        try:
+            entries = os.scandir('/proc')
+        except OSError:
+            return processes
+        
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry.name}/cmdline", 'rb') as f:
+                        raw_cmdline = f.read()
+                    with open(f"/proc/{entry.name}/stat", 'rb') as f:
+                        stat = f.read().decode(errors="replace")
+                except OSError:
+                    continue  # process exited mid-scan
+                
+                # comm is parenthesized and may itself contain spaces or parens
+                comm = stat[stat.find("(") + 1:stat.rfind(")")]
+                fields = stat[stat.rfind(")") + 2:].split()
+                argv = raw_cmdline.rstrip(b"\0").split(b"\0") if raw_cmdline else []
+                names = [os.path.basename(arg).decode(errors="replace") for arg in argv[:1]]
+                for arg in argv[1:]:
+                    if not arg.startswith(b"-"):
+                        names.append(os.path.basename(arg).decode(errors="replace"))
+                        break
+                cmdline = b" ".join(argv).decode(errors="replace").strip()
+                processes[entry.name] = {
+                    "cmdline": cmdline or f"[{comm}]",
+                    "names": names,
+                    "comm": comm,
+                    "rss": int(fields[21]),
+                    "cpu_time": int(fields[11]) + int(fields[12]),
+                    "start_time": int(fields[19])
+                }
+        return processes
+    
+    def get_process_snapshot(self):
+        """Process table for the current tick, scanning /proc if not yet done"""
+        if self._proc_snapshot is None:
+            self._proc_snapshot = self.scan_processes()
+        return self._proc_snapshot
+    
     def get_process_count(self):
         """Get number of running processes"""
-        try:
-            proc_dirs = [d for d in os.listdir('/proc') if d.isdigit()]
-            return len(proc_dirs)
-        except:
-            return 0
+        return len(self.get_process_snapshot())
     
     def get_memory_usage(self):
         """Get system memory usage"""
         try:
-            with open('/proc/meminfo', 'r') as f:
-                meminfo = {}
-                for line in f:
-                    if line.startswith(('MemTotal:', 'MemFree:', 'MemAvailable:', 'Buffers:', 'Cached:')):
-                        key, value = line.split(':')
-                        meminfo[key] = int(value.strip().split()[0]) * 1024  # Convert KB to bytes
-                
-                total = meminfo.get('MemTotal', 0)
-                available = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
-                used = total - available
-                
-                return {
-                    "total": total,
-                    "used": used,
-                    "available": available,
-                    "usage_percent": (used / total * 100) if total > 0 else 0
-                }
+            data = self.read_procfs("meminfo")
+            # Values are in KB; convert to bytes
+            meminfo = {key.decode(): int(value) * 1024 for key, value in MEMINFO_RE.findall(data)}
+            
+            total = meminfo.get('MemTotal', 0)
+            available = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+            used = total - available
+            
+            return {
+                "total": total,
+                "used": used,
+                "available": available,
+                "usage_percent": (used / total * 100) if total > 0 else 0
+            }
         except:
             return {"total": 0, "used": 0, "available": 0, "usage_percent": 0}
     
     def get_cpu_usage(self):
         """Get CPU usage statistics"""
         try:
-            with open('/proc/stat', 'r') as f:
-                cpu_line = f.readline()
-                cpu_times = [int(x) for x in cpu_line.split()[1:]]
-                
-                # Calculate CPU usage (simplified)
-                total_time = sum(cpu_times)
-                idle_time = cpu_times[3]  # idle time is 4th field
+            head = self.read_procfs("stat", CPU_STAT_READ_SIZE)
+            # A missing match raises below and falls through to the zero result
+            match = CPU_STAT_RE.match(head)
+            cpu_times = match.group(1).split()
+            
+            # Calculate CPU usage (simplified)
+            total_time = sum(map(int, cpu_times))
+            idle_time = int(cpu_times[3])  # idle time is 4th field
+            
+            if hasattr(self, '_prev_cpu_total'):
+                total_delta = total_time - self._prev_cpu_total
+                idle_delta = idle_time - self._prev_cpu_idle
                 
-                if hasattr(self, '_prev_cpu_total'):
-                    total_delta = total_time - self._prev_cpu_total
-                    idle_delta = idle_time - self._prev_cpu_idle
-                    
-                    if total_delta > 0:
-                        usage_percent = 100 * (1 - idle_delta / total_delta)
-                    else:
-                        usage_percent = 0
+                if total_delta > 0:
+                    usage_percent = 100 * (1 - idle_delta / total_delta)
                 else:
                     usage_percent = 0
-                
-                self._prev_cpu_total = total_time
-                self._prev_cpu_idle = idle_time
-                
-                return {
-                    "usage_percent": max(0, min(100, usage_percent)),
-                    "total_time": total_time,
-                    "idle_time": idle_time
-                }
+            else:
+                usage_percent = 0
+            
+            self._prev_cpu_total = total_time
+            self._prev_cpu_idle = idle_time
+            
+            return {
+                "usage_percent": max(0, min(100, usage_percent)),
+                "total_time": total_time,
+                "idle_time": idle_time
+            }
         except:
             return {"usage_percent": 0, "total_time": 0, "idle_time": 0}
     
@@ -218,90 +496,103 @@ class SymbolicStateDashboard:
     def get_network_stats(self):
         """Get network interface statistics"""
         try:
-            with open('/proc/net/dev', 'r') as f:
-                lines = f.readlines()[2:]  # Skip header lines
-                
-                net_stats = {}
-                for line in lines:
-                    parts = line.split(':')
-                    if len(parts) == 2:
-                        interface = parts[0].strip()
-                        stats = parts[1].split()
-                        
-                        if len(stats) >= 16:
-                            net_stats[interface] = {
-                                "rx_bytes": int(stats[0]),
-                                "rx_packets": int(stats[1]),
-                                "rx_errors": int(stats[2]),
-                                "tx_bytes": int(stats[8]),
-                                "tx_packets": int(stats[9]),
-                                "tx_errors": int(stats[10])
-                            }
-                
-                return net_stats
-        except:
+            data = self.read_procfs("net_dev")
+        except OSError:
             return {}
+        
+        # Header lines carry no "name:" prefix followed by counters, so they never match
+        return {
+            match.group(1).decode(): {
+                "rx_bytes": int(match.group(2)),
+                "rx_packets": int(match.group(3)),
+                "rx_errors": int(match.group(4)),
+                "tx_bytes": int(match.group(10)),
+                "tx_packets": int(match.group(11)),
+                "tx_errors": int(match.group(12))
+            }
+            for match in NET_DEV_RE.finditer(data)
+        }
     
-    def get_wolfcog_process_stats(self):
-        """Get statistics for WolfCog-specific processes"""
+    def get_wolfcog_process_stats(self, mem_total=None, uptime=None):
+        """Get statistics for WolfCog-specific processes
+        
+        CPU percent is measured over the interval since the previous tick (over
+        the process lifetime on the first sighting, as ps reports it).
+        """
         wolfcog_processes = {}
+        if mem_total is None:
+            mem_total = self.get_memory_usage()["total"]
         
-        try:
-            # Use ps to get process info
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
+        if uptime is None:
+            uptime = self.get_system_uptime()
+        
+        now = time.monotonic()
+        wall_delta = now - self._prev_proc_wall if self._prev_proc_wall is not None else 0
+        proc_times = {}
+        
+        for pid, proc in self.get_process_snapshot().items():
+            command = proc["cmdline"]
+            if not any(keyword in command for keyword in ['wolfcog', 'ecron', 'admin_agent', 'director_agent']):
+                continue
             
-            for line in result.stdout.split('\n'):
-                if any(keyword in line for keyword in ['wolfcog', 'ecron', 'admin_agent', 'director_agent']):
-                    parts = line.split()
-                    if len(parts) >= 11:
-                        pid = parts[1]
-                        cpu_percent = parts[2]
-                        mem_percent = parts[3]
-                        command = ' '.join(parts[10:])
-                        
-                        wolfcog_processes[pid] = {
-                            "cpu_percent": float(cpu_percent),
-                            "mem_percent": float(mem_percent),
-                            "command": command
-                        }
-        except:
-            pass
+            cpu_time = proc_times[pid] = proc["cpu_time"]
+            prev_time = self._prev_proc_times.get(pid)
+            if prev_time is not None and wall_delta > 0:
+                cpu_seconds, elapsed = (cpu_time - prev_time) / CLOCK_TICKS, wall_delta
+            else:
+                cpu_seconds, elapsed = cpu_time / CLOCK_TICKS, uptime - proc["start_time"] / CLOCK_TICKS
+            
+            wolfcog_processes[pid] = {
+                "cpu_percent": round(100 * cpu_seconds / elapsed, 1) if elapsed > 0 else 0.0,
+                "mem_percent": round(100 * proc["rss"] * PAGE_SIZE / mem_total, 1) if mem_total > 0 else 0.0,
+                "command": command
+            }
         
+        self._prev_proc_times = proc_times
+        self._prev_proc_wall = now
         return wolfcog_processes
             
     def collect_agent_statistics(self):
         """Collect statistics about running agents"""
         agents = {}
+        agent_pids = self.get_agent_pids()
         
-        # Check for running processes using simple ps command
-        agent_processes = ["admin_agent.py", "director_agent.py", "ecron-scheduler.py", "reflex-monitor.py", "symbolic-state-dashboard.py"]
-        
-        for agent_script in agent_processes:
+        for agent_script in self.AGENT_SCRIPTS:
             agent_name = agent_script.replace(".py", "").replace("-", "_")
+            pid = agent_pids.get(agent_script)
             agents[agent_name] = {
-                "status": "running" if self.is_process_running(agent_script) else "stopped",
-                "pid": self.get_process_pid(agent_script)
+                "status": "running" if pid else "stopped",
+                "pid": pid
             }
             
         return agents
+    
+    def get_agent_pids(self):
+        """Map each agent script to the first process running it, in one pass
+        
+        Scripts match on exact argv basenames, so e.g. ecron-scheduler-v2.py or a
+        grep for a script name is not taken for the script itself.
+        """
+        if self._script_to_pid is None:
+            script_to_pid = {}
+            for pid, proc in self.get_process_snapshot().items():
+                for name in proc["names"]:
+                    if name in self.AGENT_SCRIPTS and name not in script_to_pid:
+                        script_to_pid[name] = pid
+            self._script_to_pid = script_to_pid
+        return self._script_to_pid
         
     def is_process_running(self, script_name):
-        """Check if a process is running using ps command"""
-        try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            return script_name in result.stdout
-        except:
-            return False
+        """Check if a process is running from the /proc snapshot"""
+        return self.get_process_pid(script_name) is not None
         
     def get_process_pid(self, script_name):
-        """Get PID of a process using ps command"""
-        try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            for line in result.stdout.split('\n'):
-                if script_name in line:
-                    return line.split()[1]
-        except:
-            pass
+        """Get PID of a process from the /proc snapshot"""
+        if script_name in self.AGENT_SCRIPTS:
+            return self.get_agent_pids().get(script_name)
+        for pid, proc in self.get_process_snapshot().items():
+            if script_name in proc["names"]:
+                return pid
         return None
         
     def collect_shell_information(self):
@@ -338,10 +629,10 @@ class SymbolicStateDashboard:
         }
         
         # Count files across all spaces as nodes
-        for space in ["u", "e", "s"]:
-            space_path = Path(f"spaces/{space}")
-            if space_path.exists():
-                topology["nodes"] += len(list(space_path.glob("*")))
+        for space in self.SPACES:
+            scan = self.get_space_scan(space)
+            if scan:
+                topology["nodes"] += scan["entries"]
                 
         # Simulate topology metrics
         topology["connections"] = topology["nodes"] * 2
@@ -352,107 +643,108 @@ class SymbolicStateDashboard:
         
     def collect_recent_mutations(self):
         """Collect recent symbolic mutations"""
-        mutations = []
-        
-        # Check for recent file changes in spaces
-        for space in ["u", "e", "s"]:
-            space_path = Path(f"spaces/{space}")
-            if space_path.exists():
-                for file_path in space_path.rglob("*"):
-                    if file_path.is_file():
-                        mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                        if (datetime.now() - mod_time).total_seconds() < 300:  # Last 5 minutes
-                            mutations.append({
-                                "type": "file_mutation",
-                                "location": str(file_path),
-                                "timestamp": mod_time.isoformat(),
-                                "space": space
-                            })
-                            
-        # Keep only the 10 most recent mutations
-        mutations.sort(key=lambda x: x["timestamp"], reverse=True)
-        return mutations[:10]
+        candidates = []
+        
+        # Recent file changes in spaces were picked out during the walk
+        for space in self.SPACES:
+            scan = self.get_space_scan(space)
+            if scan:
+                candidates.extend((mtime, path, space) for mtime, path in scan["recent"])
+        
+        # Keep only the 10 most recent mutations; only these get a timestamp string
+        return [{
+            "type": "file_mutation",
+            "location": path,
+            "timestamp": datetime.fromtimestamp(mtime).isoformat(),
+            "space": space
+        } for mtime, path, space in heapq.nlargest(10, candidates)]
         
     def get_system_uptime(self):
         """Get system uptime in seconds"""
         try:
-            with open('/proc/uptime', 'r') as f:
-                return float(f.read().split()[0])
+            return float(self.read_procfs("uptime").split()[0])
         except:
             return 0
             
     def save_metrics(self):
-        """Save current metrics to file"""
-        with open(self.dashboard_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
+        """Save current metrics to file
+        
+        Written compactly to a temp file and swapped in, so readers never see a
+        partially written dashboard.
+        """
+        tmp_file = self.dashboard_file + ".tmp"
+        with open(tmp_file, 'wb', buffering=JSON_WRITE_BUFFER) as f:
+            json_dump(self.metrics, f)
+        os.replace(tmp_file, self.dashboard_file)
             
     def print_dashboard_summary(self):
         """Print a text summary of the dashboard"""
-        if not self.metrics:
+        if self.metrics["timestamp"] is None:
             return
             
-        print("\n" + "="*60)
-        print("🐺 WolfCog Symbolic State Dashboard")
-        print("="*60)
-        print(f"⏰ Last Update: {self.metrics['timestamp']}")
-        print("🔄 System Uptime: {:.0f} seconds".format(self.metrics['uptime']))
+        lines = ["", BANNER, "🐺 WolfCog Symbolic State Dashboard", BANNER]
+        lines.append(f"⏰ Last Update: {self.metrics['timestamp']}")
+        lines.append("🔄 System Uptime: {:.0f} seconds".format(self.metrics['uptime']))
         
         # System Performance
         perf = self.metrics['system_performance']
-        print("⚡ System Performance:")
-        print(f"  📊 Load Average: {perf['load_average']['1min']:.2f} (1m), {perf['load_average']['5min']:.2f} (5m)")
-        print(f"  🧠 Memory: {perf['memory_usage']['usage_percent']:.1f}% used ({perf['memory_usage']['used']/(1024**3):.1f}GB)")
-        print(f"  💻 CPU: {perf['cpu_usage']['usage_percent']:.1f}% utilization")
-        print(f"  💾 Disk: {perf['disk_usage']['/']['usage_percent']:.1f}% used")
-        print(f"  🐺 WolfCog Processes: {len(perf['wolfcog_processes'])}")
-        print()
+        lines.append("⚡ System Performance:")
+        lines.append(f"  📊 Load Average: {perf['load_average']['1min']:.2f} (1m), {perf['load_average']['5min']:.2f} (5m)")
+        lines.append(f"  🧠 Memory: {perf['memory_usage']['usage_percent']:.1f}% used ({perf['memory_usage']['used']/(1024**3):.1f}GB)")
+        lines.append(f"  💻 CPU: {perf['cpu_usage']['usage_percent']:.1f}% utilization")
+        lines.append(f"  💾 Disk: {perf['disk_usage']['/']['usage_percent']:.1f}% used")
+        lines.append(f"  🐺 WolfCog Processes: {len(perf['wolfcog_processes'])}")
+        lines.append("")
         
         # Spaces summary
-        print("📁 Symbolic Spaces:")
+        lines.append("📁 Symbolic Spaces:")
         for space, data in self.metrics['spaces'].items():
             status_emoji = "🟢" if data['activity'] == 'active' else "🔴"
-            print(f"  {status_emoji} /{space}/ - {data['files']} files, {data['memory_usage']} bytes")
-        print()
+            lines.append(f"  {status_emoji} /{space}/ - {data['files']} files, {data['memory_usage']} bytes")
+        lines.append("")
         
         # Tasks summary
         tasks = self.metrics['tasks']
-        print("📋 Task Queue:")
-        print(f"  ⏳ Pending: {tasks['pending']}")
-        print(f"  ✅ Processed: {tasks['processed']}")
-        print(f"  ❌ Failed: {tasks['failed']}")
-        print()
+        lines.append("📋 Task Queue:")
+        lines.append(f"  ⏳ Pending: {tasks['pending']}")
+        lines.append(f"  ✅ Processed: {tasks['processed']}")
+        lines.append(f"  ❌ Failed: {tasks['failed']}")
+        lines.append("")
         
         # Agents summary
-        print("🤖 Agents:")
+        lines.append("🤖 Agents:")
         for agent, data in self.metrics['agents'].items():
             status_emoji = "🟢" if data['status'] == 'running' else "🔴"
-            print(f"  {status_emoji} {agent}: {data['status']} (PID: {data['pid']})")
-        print()
+            lines.append(f"  {status_emoji} {agent}: {data['status']} (PID: {data['pid']})")
+        lines.append("")
         
         # Shell information
         shell = self.metrics['shell']
-        print("🚶 Shell State:")
-        print(f"  📏 Depth: {shell['depth']}")
-        print(f"  🔄 Recursions: {shell['recursions']}")
-        print(f"  📍 Current Space: {shell['current_space']}")
-        print()
+        lines.append("🚶 Shell State:")
+        lines.append(f"  📏 Depth: {shell['depth']}")
+        lines.append(f"  🔄 Recursions: {shell['recursions']}")
+        lines.append(f"  📍 Current Space: {shell['current_space']}")
+        lines.append("")
         
         # Memory topology
         topology = self.metrics['memory_topology']
-        print("🗺️ Memory Topology:")
-        print(f"  🔵 Nodes: {topology['nodes']}")
-        print(f"  🔗 Connections: {topology['connections']}")
-        print(f"  📊 Complexity: {topology['complexity']:.2f}")
-        print()
+        lines.append("🗺️ Memory Topology:")
+        lines.append(f"  🔵 Nodes: {topology['nodes']}")
+        lines.append(f"  🔗 Connections: {topology['connections']}")
+        lines.append(f"  📊 Complexity: {topology['complexity']:.2f}")
+        lines.append("")
         
         # Recent mutations
         mutations = self.metrics['recent_mutations']
-        print(f"🧬 Recent Mutations ({len(mutations)}):")
+        lines.append(f"🧬 Recent Mutations ({len(mutations)}):")
         for mutation in mutations[:3]:  # Show only first 3
-            print(f"  🔹 {mutation['type']} in {mutation['space']} at {mutation['timestamp']}")
-        print()
+            lines.append(f"  🔹 {mutation['type']} in {mutation['space']} at {mutation['timestamp']}")
+        lines.append("")
         
-        print("="*60)
+        lines.append(BANNER)
+        
+        # One write per tick instead of a locked, flushed print per line
+        sys.stdout.write("\n".join(lines) + "\n")
         
     def monitoring_loop(self):
         """Main monitoring loop"""
@@ -469,33 +761,34 @@ class SymbolicStateDashboard:
                 # Print summary
                 self.print_dashboard_summary()
                 
-                # Wait for next update
-                time.sleep(self.update_interval)
+                # Wait for next update (returns early on stop)
+                self._stop_event.wait(self.update_interval)
                 
             except KeyboardInterrupt:
                 print("\n🛑 Dashboard monitoring stopped by user")
                 break
             except Exception as e:
                 print(f"❌ Error in monitoring loop: {e}")
-                time.sleep(self.update_interval)
+                self._stop_event.wait(self.update_interval)
                 
-    def start(self):
-        """Start the dashboard monitoring"""
+    def run(self):
+        """Run the dashboard monitoring on the calling thread until stopped"""
         print("📊 Starting WolfCog Symbolic State Dashboard...")
         self.running = True
-        
-        # Start monitoring in a separate thread
-        monitor_thread = threading.Thread(target=self.monitoring_loop)
-        monitor_thread.daemon = True
-        monitor_thread.start()
-        
+        self._stop_event.clear()
         print("✨ Dashboard monitoring active!")
-        return monitor_thread
+        try:
+            self.monitoring_loop()
+        finally:
+            self.io_pool.shutdown(wait=True)
+            self.close_procfs_files()
         
     def stop(self):
-        """Stop the dashboard monitoring"""
-        print("🛑 Stopping dashboard monitoring...")
+        """Stop the dashboard monitoring; safe to call from a signal handler"""
+        # Flag first, so the loop exits even if the print below is interrupted
         self.running = False
+        self._stop_event.set()
+        print("🛑 Stopping dashboard monitoring...")
         
     def get_metrics(self):
         """Get current metrics"""
@@ -505,17 +798,12 @@ def main():
     """Main function for standalone execution"""
     dashboard = SymbolicStateDashboard()
     
-    try:
-        # Start monitoring
-        monitor_thread = dashboard.start()
-        
-        # Keep running until interrupted
-        while dashboard.running:
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        print("\n🛑 Shutting down dashboard...")
-        dashboard.stop()
+    # Monitoring runs on the main thread; signals just ask the loop to finish
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda signum, frame: dashboard.stop())
+    
+    dashboard.run()
+    print("\n🛑 Shutting down dashboard...")
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
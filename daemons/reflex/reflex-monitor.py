@@ -4,48 +4,208 @@ Reflex Daemon - Reactive monitoring for WolfCog AGI-OS
 Monitors shells and self-modifying symbols for reactive responses
 """
 
+import atexit
+import logging
+import logging.handlers
+import os
 import time
 import threading
 import json
+import codecs
 import hashlib
+import itertools
+import queue
+import re
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+# Handlers only enqueue log records; a listener thread does the terminal writes.
+# Per-event messages are logged at DEBUG
+logger = logging.getLogger("wolfcog.reflex")
+_log_queue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+if not logger.handlers:
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    log_listener.start()
+    atexit.register(log_listener.stop)  # flushes queued records
+
+# Change detection only compares digests, so a fast non-cryptographic hash will do;
+# prefer SIMD xxh3 when installed
+try:
+    import xxhash
+    
+    def new_content_hash():
+        return xxhash.xxh3_128()
+except ImportError:
+    def new_content_hash():
+        return hashlib.blake2b(digest_size=16)
+
+# Prefer orjson for the index and message files when installed
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+    
+    def json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    
+    def json_loads(data):
+        return json.loads(data)
+
+# Files are hashed in chunks of this size, so memory use does not grow with them
+HASH_CHUNK_SIZE = 1 << 20
+
+# Most recently used file hashes kept by calculate_file_hash
+HASH_CACHE_SIZE = 4096
+# New JSON files up to this size are parsed in the same read that hashes them
+PARSE_JSON_LIMIT = 64 * 1024
+# The hash cache is saved here on stop and reloaded on start
+HASH_CACHE_FILE = "/tmp/wolfcog_reflex_hashes.json"
+
+# Seconds a path must go without events before its coalesced event is handled
+DEBOUNCE_DELAY = 0.15
+
+# Memory index per space: index.json snapshot plus an index.ndjson log of later
+# changes, folded back into the snapshot once it reaches INDEX_COMPACT_LINES
+MEMORY_INDEX_ROOT = "/tmp/wolfcog_memory_index"
+MAX_INDEX_ENTRIES = 1000
+INDEX_COMPACT_LINES = 2000
+
+# Path fragments that route a reaction, in order of precedence
+RESPONSE_ROUTES = ("kernels/", "spaces/", "ecron_tasks", "agents/")
+RESPONSE_ROUTE_RE = re.compile("|".join(map(re.escape, RESPONSE_ROUTES)))
+
+# Memory spaces in order of precedence, and the path components naming them
+MEMORY_SPACES = ("u", "e", "s")
+MEMORY_SPACE_RE = re.compile(r'/([ues])(?=/)|^spaces/([ues])')
+
+# Semantic tags and the content that earns them; keywords match in any case
+SYMBOLIC_PATTERNS = ('∇', '∂', '⊗', 'Φ', 'Ω', '∑')
+COGNITIVE_KEYWORDS = ('cognitive', 'symbolic', 'memory', 'evolution', 'meta', 'recursive')
+CODE_PATTERNS = {
+    "code_definitions": ('def ', 'define ', 'function'),
+    "code_imports": ('import', 'require', 'use-modules')
+}
+SEMANTIC_TAGS = {pattern: f"symbolic_{pattern}" for pattern in SYMBOLIC_PATTERNS}
+SEMANTIC_TAGS.update((keyword, f"concept_{keyword}") for keyword in COGNITIVE_KEYWORDS)
+SEMANTIC_TAGS.update((pattern, tag) for tag, patterns in CODE_PATTERNS.items() for pattern in patterns)
+# Order in which extract_semantic_tags reports tags
+SEMANTIC_TAG_ORDER = tuple(dict.fromkeys(SEMANTIC_TAGS.values()))
+# One alternation finds every pattern in a single pass over the content. The
+# keywords fold ASCII case only, as content.lower() does for them; full Unicode
+# folding would also match e.g. "ſymbolic", which has no tag
+SEMANTIC_TAG_RE = re.compile("|".join(
+    [re.escape(pattern) for pattern in SYMBOLIC_PATTERNS] +
+    ["(?ai:" + "|".join(map(re.escape, COGNITIVE_KEYWORDS)) + ")"] +
+    [re.escape(pattern) for patterns in CODE_PATTERNS.values() for pattern in patterns]
+))
+# Text carried between chunks so a pattern split across them is still found
+SEMANTIC_TAG_OVERLAP = max(map(len, SEMANTIC_TAGS)) - 1
+# Files whose content is scanned for semantic tags when indexed
+TAGGED_SUFFIXES = frozenset({'.txt', '.json', '.scm', '.lisp'})
+
+# Content type of a memory file by its lowercased suffix
+CONTENT_TYPES = {
+    '.json': 'structured_data',
+    '.txt': 'text',
+    '.scm': 'scheme_code',
+    '.lisp': 'lisp_code',
+    '.wl': 'wolfram_code',
+    '.py': 'python_code',
+    '.md': 'markdown',
+    '.log': 'log_data'
+}
+
+# Drop directories polled by other daemons, which consume one JSON file per message
+SIGNALS_DIR = "/tmp/wolfcog_signals"
+NOTIFICATIONS_DIR = "/tmp/scheduler_notifications"
+COMMANDS_DIR = "/tmp/coordinator_commands"
+
+# Most recent reactions kept for inspection
+REACTION_HISTORY_SIZE = 10000
+
+# Worker threads that index memory files; a path always goes to the same one,
+# so responses for one file still run in order
+INDEX_WORKERS = 4
+
+# Seconds a scan of running scripts is reused by is_agent_running
+AGENT_SCAN_TTL = 2.0
+
 class ReflexEventHandler(FileSystemEventHandler):
     def __init__(self, reflex_daemon):
         self.reflex_daemon = reflex_daemon
     
     def on_modified(self, event):
         if not event.is_directory:
-            self.reflex_daemon.handle_file_change(event.src_path)
+            self.reflex_daemon.queue_file_event(event.src_path, "modified")
     
     def on_created(self, event):
         if not event.is_directory:
-            self.reflex_daemon.handle_file_creation(event.src_path)
+            self.reflex_daemon.queue_file_event(event.src_path, "created")
     
     def on_deleted(self, event):
         if not event.is_directory:
-            self.reflex_daemon.handle_file_deletion(event.src_path)
+            self.reflex_daemon.queue_file_event(event.src_path, "deleted")
 
 class ReflexDaemon:
     def __init__(self):
         self.running = False
-        self.observers = []
+        self.observer = None  # one watchdog thread serves every watch path
         self.watch_paths = [
             "spaces/",
             "kernels/",
             "/tmp/ecron_tasks",
             "agents/"
         ]
-        self.reactions = []
+        self.reactions = deque(maxlen=REACTION_HISTORY_SIZE)
+        self.total_reactions = 0
+        self._symbolic_event = threading.Event()  # set when symbolic content is indexed or changes
         self.file_states = {}
-        self.response_queue = []
+        # (priority, sequence, response); the sequence keeps equal priorities FIFO
+        self.response_queue = queue.PriorityQueue()
+        self._response_sequence = itertools.count()
+        # path -> ((st_mtime_ns, st_size), hash), least recently used first
+        self._hash_cache = OrderedDict()
+        self._hash_lock = threading.Lock()
+        # path -> (event type, monotonic deadline) of events waiting out DEBOUNCE_DELAY
+        self._pending_events = {}
+        self._pending_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._index_cache = {}  # space -> OrderedDict(path -> entry), oldest first
+        self._index_logs = {}  # space -> [open index.ndjson, lines written]
+        self._index_lock = threading.Lock()
+        self._message_dirs = set()  # drop and index directories known to exist
+        self._message_sequence = itertools.count()
+        self._running_scripts = (None, frozenset())  # (monotonic scan time, script names)
+        self.index_workers = [ThreadPoolExecutor(max_workers=1) for _ in range(INDEX_WORKERS)]
+        self.route_handlers = {
+            "kernels/": self.handle_kernel_change,
+            "spaces/": self.handle_space_change,
+            "ecron_tasks": self.handle_task_change,
+            "agents/": self.handle_agent_change
+        }
         
     def start(self):
         """Start the reflex daemon"""
-        print("⚡ Starting Reflex Daemon...")
+        logger.info("⚡ Starting Reflex Daemon...")
         self.running = True
+        self.load_hash_cache()
+        
+        # Handle debounced file events
+        debounce_thread = threading.Thread(target=self.process_file_events)
+        debounce_thread.daemon = True
+        debounce_thread.start()
         
         # Start file system monitoring
         self.start_monitoring()
@@ -60,24 +220,71 @@ class ReflexDaemon:
         symbolic_thread.daemon = True
         symbolic_thread.start()
         
-        print("👁️ Reflex Daemon monitoring for reactive responses...")
+        logger.info("👁️ Reflex Daemon monitoring for reactive responses...")
     
     def start_monitoring(self):
         """Start file system monitoring"""
         event_handler = ReflexEventHandler(self)
+        self.observer = Observer()
         
         for watch_path in self.watch_paths:
             path = Path(watch_path)
             if path.exists():
-                observer = Observer()
-                observer.schedule(event_handler, str(path), recursive=True)
-                observer.start()
-                self.observers.append(observer)
-                print(f"👀 Monitoring: {watch_path}")
+                self.observer.schedule(event_handler, str(path), recursive=True)
+                logger.info("👀 Monitoring: %s", watch_path)
+        
+        self.observer.start()
+    
+    def queue_file_event(self, file_path, event_type):
+        """Record a file event, to be handled once the path has been quiet
+        
+        Editors and git emit several events per logical change; those within
+        DEBOUNCE_DELAY of each other are merged into one. A deletion supersedes
+        anything before it, a creation absorbs later modifications, and a
+        deletion followed by a creation is handled as the creation, so routes
+        that only react to new files still see a re-created one.
+        """
+        with self._pending_lock:
+            pending = self._pending_events.get(file_path)
+            if pending is not None:
+                previous_type = pending[0]
+                if previous_type == "created" and event_type == "modified":
+                    event_type = "created"
+            self._pending_events[file_path] = (event_type, time.monotonic() + DEBOUNCE_DELAY)
+        self._pending_event.set()
+    
+    def process_file_events(self):
+        """Handle queued file events once their quiet period has passed"""
+        handlers = {
+            "modified": self.handle_file_change,
+            "created": self.handle_file_creation,
+            "deleted": self.handle_file_deletion
+        }
+        
+        while self.running:
+            now = time.monotonic()
+            with self._pending_lock:
+                due = [(path, event_type) for path, (event_type, deadline)
+                       in self._pending_events.items() if deadline <= now]
+                for path, _ in due:
+                    del self._pending_events[path]
+                next_deadline = min((deadline for _, deadline in self._pending_events.values()),
+                                    default=None)
+                self._pending_event.clear()
+            
+            for path, event_type in due:
+                try:
+                    handlers[event_type](path)
+                except Exception as e:
+                    logger.error("❌ File event handling error: %s", e)
+            
+            # Sleep until the next deadline, or until a new event or stop() arrives
+            timeout = None if next_deadline is None else max(0, next_deadline - time.monotonic())
+            self._pending_event.wait(timeout)
     
     def handle_file_change(self, file_path):
         """Handle file modification events"""
-        print(f"📝 File modified: {file_path}")
+        logger.debug("📝 File modified: %s", file_path)
         
         # Calculate file hash to detect actual changes
         current_hash = self.calculate_file_hash(file_path)
@@ -98,20 +305,27 @@ class ReflexDaemon:
     
     def handle_file_creation(self, file_path):
         """Handle file creation events"""
-        print(f"✨ File created: {file_path}")
+        logger.debug("✨ File created: %s", file_path)
         
         reaction = {
             "type": "file_created",
             "path": file_path,
-            "timestamp": time.time(),
-            "hash": self.calculate_file_hash(file_path)
+            "timestamp": time.time()
         }
         
+        # Small JSON files (new tasks) are parsed now, so responses need not re-read them
+        if file_path.endswith(".json"):
+            reaction["hash"], parsed = self.hash_and_parse_json(file_path)
+            if parsed is not None:
+                reaction["parsed"] = parsed
+        else:
+            reaction["hash"] = self.calculate_file_hash(file_path)
+        
         self.trigger_reaction(reaction)
     
     def handle_file_deletion(self, file_path):
         """Handle file deletion events"""
-        print(f"🗑️ File deleted: {file_path}")
+        logger.debug("🗑️ File deleted: %s", file_path)
         
         reaction = {
             "type": "file_deleted",
@@ -123,41 +337,209 @@ class ReflexDaemon:
         # Remove from tracked states
         if file_path in self.file_states:
             del self.file_states[file_path]
+        with self._hash_lock:
+            self._hash_cache.pop(file_path, None)
         
         self.trigger_reaction(reaction)
     
     def calculate_file_hash(self, file_path):
-        """Calculate hash of file contents"""
+        """Calculate hash of file contents
+        
+        Watchdog reports several modifications per save, so the hash is cached
+        and only recomputed when the file's mtime or size has changed.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        stat_key = (st.st_mtime_ns, st.st_size)
+        
+        file_hash = self.get_cached_hash(file_path, stat_key)
+        if file_hash is None:
+            file_hash = self.hash_file_contents(file_path)
+            self.cache_file_hash(file_path, stat_key, file_hash)
+        return file_hash
+    
+    def get_cached_hash(self, file_path, stat_key):
+        """Cached hash of a file if it was taken at the same (mtime, size), else None"""
+        with self._hash_lock:
+            cached = self._hash_cache.get(file_path)
+            if cached is not None and cached[0] == stat_key:
+                self._hash_cache.move_to_end(file_path)
+                return cached[1]
+        return None
+    
+    def cache_file_hash(self, file_path, stat_key, file_hash):
+        """Remember a file's hash for its (mtime, size), evicting the least recent"""
+        if file_hash is None:
+            return
+        with self._hash_lock:
+            self._hash_cache[file_path] = (stat_key, file_hash)
+            self._hash_cache.move_to_end(file_path)
+            if len(self._hash_cache) > HASH_CACHE_SIZE:
+                self._hash_cache.popitem(last=False)
+    
+    def hash_and_parse_json(self, file_path):
+        """(hash, parsed content) of a JSON file from a single read
+        
+        The content is None for files over PARSE_JSON_LIMIT or that do not parse;
+        those are just hashed.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None, None
+        if st.st_size > PARSE_JSON_LIMIT:
+            return self.calculate_file_hash(file_path), None
+        
         try:
             with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+                data = f.read()
+        except OSError:
+            return None, None
+        
+        stat_key = (st.st_mtime_ns, st.st_size)
+        file_hash = self.get_cached_hash(file_path, stat_key)
+        if file_hash is None:
+            digest = new_content_hash()
+            digest.update(data)
+            file_hash = digest.hexdigest()
+            self.cache_file_hash(file_path, stat_key, file_hash)
+        
+        try:
+            return file_hash, json_loads(data)
+        except ValueError:
+            return file_hash, None
+    
+    def load_hash_cache(self):
+        """Restore the hash cache saved by save_hash_cache, if any"""
+        try:
+            with open(HASH_CACHE_FILE, 'rb') as f:
+                records = json_loads(f.read())
+        except (OSError, ValueError):
+            return
+        
+        # Anything not shaped the way save_hash_cache writes it is ignored
+        # and the cache starts empty
+        if not isinstance(records, list):
+            return
+        entries = []
+        for record in records[-HASH_CACHE_SIZE:]:
+            if not (isinstance(record, list) and len(record) == 4):
+                return
+            file_path, mtime_ns, size, file_hash = record
+            if not (isinstance(file_path, str) and type(mtime_ns) is int and
+                    type(size) is int and isinstance(file_hash, str)):
+                return
+            entries.append((file_path, ((mtime_ns, size), file_hash)))
+        
+        with self._hash_lock:
+            for file_path, entry in entries:
+                self._hash_cache[file_path] = entry
+                self._hash_cache.move_to_end(file_path)
+            while len(self._hash_cache) > HASH_CACHE_SIZE:
+                self._hash_cache.popitem(last=False)
+    
+    def save_hash_cache(self):
+        """Save the hash cache as [[path, mtime_ns, size, hash], ...], oldest first
+        
+        Entries are checked against the file's stat when used, so a stale entry
+        only costs a re-hash.
+        """
+        with self._hash_lock:
+            records = [[file_path, mtime_ns, size, file_hash]
+                       for file_path, ((mtime_ns, size), file_hash) in self._hash_cache.items()]
+        
+        tmp_file = HASH_CACHE_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(records))
+        os.replace(tmp_file, HASH_CACHE_FILE)
+    
+    def hash_and_tag_file(self, file_path):
+        """(hash, semantic tags) of a file from a single streaming read
+        
+        Each chunk feeds both the digest and the tag scan; the digest is skipped
+        when the cache already holds a current hash. Tags are empty if the file
+        is not valid UTF-8 text.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None, []
+        stat_key = (st.st_mtime_ns, st.st_size)
+        file_hash = self.get_cached_hash(file_path, stat_key)
+        digest = new_content_hash() if file_hash is None else None
+        
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        found = set()
+        tail = ""
+        try:
+            with open(file_path, 'rb', buffering=0) as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    if digest is not None:
+                        digest.update(chunk)
+                    if decoder is None:
+                        continue
+                    try:
+                        text = tail + decoder.decode(chunk)
+                    except UnicodeDecodeError:
+                        decoder = None
+                        continue
+                    self.scan_semantic_tags(text, found)
+                    tail = text[-SEMANTIC_TAG_OVERLAP:]
+            if decoder is not None:
+                decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            decoder = None  # ends in a truncated character
+        except OSError:
+            return file_hash, []
+        
+        if digest is not None:
+            file_hash = digest.hexdigest()
+            self.cache_file_hash(file_path, stat_key, file_hash)
+        tags = [tag for tag in SEMANTIC_TAG_ORDER if tag in found] if decoder is not None else []
+        return file_hash, tags
+    
+    def hash_file_contents(self, file_path):
+        """Hash file contents, streaming them in HASH_CHUNK_SIZE reads
+        
+        On Python 3.11+ hashlib.file_digest reads into one reused buffer; the
+        digests release the GIL while hashing each large block.
+        """
+        try:
+            with open(file_path, 'rb', buffering=0) as f:
+                if hasattr(hashlib, "file_digest"):
+                    return hashlib.file_digest(f, new_content_hash).hexdigest()
+                digest = new_content_hash()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
         except Exception:
             return None
     
     def trigger_reaction(self, reaction):
         """Trigger a reactive response"""
         self.reactions.append(reaction)
+        self.total_reactions += 1
         
         # Determine response based on reaction type and context
         response = self.determine_response(reaction)
         if response:
-            self.response_queue.append(response)
-            print(f"⚡ Triggered reaction: {reaction['type']} -> {response['action']}")
+            self.response_queue.put((response["priority"], next(self._response_sequence), response))
+            logger.debug("⚡ Triggered reaction: %s -> %s", reaction['type'], response['action'])
     
     def determine_response(self, reaction):
         """Determine appropriate response to a reaction"""
         file_path = reaction["path"]
-        reaction_type = reaction["type"]
-        
-        # Response rules based on file type and location
-        if "kernels/" in file_path:
-            return self.handle_kernel_change(reaction)
-        elif "spaces/" in file_path:
-            return self.handle_space_change(reaction)
-        elif "ecron_tasks" in file_path:
-            return self.handle_task_change(reaction)
-        elif "agents/" in file_path:
-            return self.handle_agent_change(reaction)
+        
+        # Response rules based on file type and location, found in one scan
+        found = set(RESPONSE_ROUTE_RE.findall(file_path))
+        if not found:
+            return None
+        
+        for route in RESPONSE_ROUTES:
+            if route in found:
+                return self.route_handlers[route](reaction)
         
         return None
     
@@ -197,7 +579,8 @@ class ReflexDaemon:
                 "action": "notify_scheduler",
                 "target": reaction["path"],
                 "priority": 1,
-                "timestamp": time.time()
+                "timestamp": time.time(),
+                "task_data": reaction.get("parsed")
             }
         return None
     
@@ -213,45 +596,51 @@ class ReflexDaemon:
         return None
     
     def process_responses(self):
-        """Process reactive responses"""
+        """Process reactive responses as they arrive, lowest priority number first"""
         while self.running:
             try:
-                if self.response_queue:
-                    # Sort by priority (lower number = higher priority)
-                    self.response_queue.sort(key=lambda x: x["priority"])
-                    response = self.response_queue.pop(0)
-                    
-                    self.execute_response(response)
-                
-            except Exception as e:
-                print(f"❌ Response processing error: {e}")
+                # Blocks while idle; the timeout only bounds how long stop() takes
+                _, _, response = self.response_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
             
-            time.sleep(1)  # Process responses every second
+            try:
+                self.execute_response(response)
+            except Exception as e:
+                logger.error("❌ Response processing error: %s", e)
     
     def execute_response(self, response):
         """Execute a reactive response"""
         action = response["action"]
         target = response["target"]
         
-        print(f"🎯 Executing reflex response: {action} on {target}")
+        logger.debug("🎯 Executing reflex response: %s on %s", action, target)
         
         if action == "reload_kernel":
             self.reload_kernel(target)
         elif action == "index_memory":
-            self.index_memory(target)
+            self.submit_index_work(target, self.index_memory)
         elif action == "update_memory":
-            self.update_memory(target)
+            self.submit_index_work(target, self.update_memory)
         elif action == "notify_scheduler":
-            self.notify_scheduler(target)
+            self.notify_scheduler(target, response.get("task_data"))
         elif action == "restart_agent":
             self.restart_agent(target)
     
+    def submit_index_work(self, memory_path, handler):
+        """Run an I/O-bound memory handler on the index worker owning the path"""
+        worker = self.index_workers[hash(memory_path) % len(self.index_workers)]
+        try:
+            worker.submit(handler, memory_path)
+        except RuntimeError:
+            pass  # workers already shut down by stop()
+    
     def reload_kernel(self, kernel_path):
         """Reload a modified kernel"""
-        print(f"🔄 Reloading kernel: {kernel_path}")
+        logger.debug("🔄 Reloading kernel: %s", kernel_path)
         
         try:
-            kernel_name = Path(kernel_path).stem
+            kernel_name = os.path.splitext(os.path.basename(kernel_path))[0]
             
             # Determine kernel type and reload strategy
             if kernel_path.endswith('.lisp'):
@@ -263,10 +652,10 @@ class ReflexDaemon:
             elif kernel_path.endswith('.py'):
                 self.reload_python_kernel(kernel_path, kernel_name)
             else:
-                print(f"⚠️ Unknown kernel type: {kernel_path}")
+                logger.warning("⚠️ Unknown kernel type: %s", kernel_path)
                 
         except Exception as e:
-            print(f"❌ Kernel reload error: {e}")
+            logger.error("❌ Kernel reload error: %s", e)
     
     def reload_lisp_kernel(self, kernel_path, kernel_name):
         """Reload a Lisp kernel"""
@@ -280,7 +669,7 @@ class ReflexDaemon:
         }
         
         self.broadcast_signal(reload_signal)
-        print(f"🔄 Lisp kernel {kernel_name} reload signaled")
+        logger.info("🔄 Lisp kernel %s reload signaled", kernel_name)
     
     def reload_guile_kernel(self, kernel_path, kernel_name):
         """Reload a Guile/Scheme kernel"""
@@ -294,7 +683,7 @@ class ReflexDaemon:
         }
         
         self.broadcast_signal(reload_signal)
-        print(f"🔄 Guile kernel {kernel_name} reload signaled")
+        logger.info("🔄 Guile kernel %s reload signaled", kernel_name)
     
     def reload_wolfram_kernel(self, kernel_path, kernel_name):
         """Reload a Wolfram Language kernel"""
@@ -308,7 +697,7 @@ class ReflexDaemon:
         }
         
         self.broadcast_signal(reload_signal)
-        print(f"🔄 Wolfram kernel {kernel_name} reload signaled")
+        logger.info("🔄 Wolfram kernel %s reload signaled", kernel_name)
     
     def reload_python_kernel(self, kernel_path, kernel_name):
         """Reload a Python kernel/module"""
@@ -322,33 +711,45 @@ class ReflexDaemon:
             
             if module_name in sys.modules:
                 importlib.reload(sys.modules[module_name])
-                print(f"🔄 Python module {module_name} reloaded")
+                logger.info("🔄 Python module %s reloaded", module_name)
             else:
-                print(f"🔄 Python module {module_name} not currently loaded")
+                logger.info("🔄 Python module %s not currently loaded", module_name)
                 
         except Exception as e:
-            print(f"⚠️ Python module reload failed: {e}")
+            logger.warning("⚠️ Python module reload failed: %s", e)
     
     def broadcast_signal(self, signal):
         """Broadcast reload signal to system components"""
-        signals_dir = Path("/tmp/wolfcog_signals")
-        signals_dir.mkdir(exist_ok=True)
+        self.write_message(SIGNALS_DIR, f"signal_{int(time.time())}", f"_{signal['type']}.json", signal)
+        
+        logger.debug("📡 Signal broadcasted: %s", signal['type'])
+    
+    def write_message(self, directory, prefix, suffix, message):
+        """Drop a JSON message file into a directory polled by another daemon
         
-        signal_file = signals_dir / f"signal_{int(time.time())}_{signal['type']}.json"
-        with open(signal_file, 'w') as f:
-            json.dump(signal, f, indent=2)
+        A sequence number between prefix and suffix keeps messages of the same
+        second apart, and the file is renamed into place so readers never see
+        it half written. The directory is only created on first use.
+        """
+        if directory not in self._message_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._message_dirs.add(directory)
         
-        print(f"📡 Signal broadcasted: {signal['type']}")
+        name = f"{prefix}_{next(self._message_sequence)}{suffix}"
+        tmp_path = f"{directory}/.{name}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json_dumps(message))
+        os.replace(tmp_path, f"{directory}/{name}")
     
     def index_memory(self, memory_path):
         """Index new memory structure"""
-        print(f"📚 Indexing memory: {memory_path}")
+        logger.debug("📚 Indexing memory: %s", memory_path)
         
         try:
-            memory_file = Path(memory_path)
-            
-            if not memory_file.exists():
-                print(f"⚠️ Memory file not found: {memory_path}")
+            try:
+                st = os.stat(memory_path)
+            except FileNotFoundError:
+                logger.warning("⚠️ Memory file not found: %s", memory_path)
                 return
             
             # Determine memory space
@@ -359,119 +760,180 @@ class ReflexDaemon:
                 "path": str(memory_path),
                 "space": space,
                 "indexed_at": time.time(),
-                "file_size": memory_file.stat().st_size,
-                "file_hash": self.calculate_file_hash(memory_path),
-                "content_type": self.detect_content_type(memory_file)
+                "file_size": st.st_size,
+                "content_type": self.detect_content_type(memory_path)
             }
             
-            # Add semantic analysis
-            if memory_file.suffix in ['.txt', '.json', '.scm', '.lisp']:
-                index_entry["semantic_tags"] = self.extract_semantic_tags(memory_file)
+            # Hash and semantic analysis share one read of the file
+            if os.path.splitext(memory_path)[1] in TAGGED_SUFFIXES:
+                index_entry["file_hash"], index_entry["semantic_tags"] = self.hash_and_tag_file(memory_path)
+                self.signal_if_symbolic(index_entry)
+            else:
+                index_entry["file_hash"] = self.calculate_file_hash(memory_path)
             
             # Save to memory index
             self.save_to_memory_index(space, index_entry)
             
-            print(f"📊 Memory indexed: {space}/{memory_file.name}")
+            logger.info("📊 Memory indexed: %s/%s", space, os.path.basename(memory_path))
             
         except Exception as e:
-            print(f"❌ Memory indexing error: {e}")
+            logger.error("❌ Memory indexing error: %s", e)
+    
+    def signal_if_symbolic(self, index_entry):
+        """Wake the symbolic monitor if an indexed file holds symbolic expressions"""
+        if any(tag.startswith("symbolic_") for tag in index_entry.get("semantic_tags", ())):
+            self._symbolic_event.set()
     
     def determine_memory_space(self, memory_path):
         """Determine which memory space a file belongs to"""
-        if "/u/" in memory_path or memory_path.startswith("spaces/u"):
-            return "u"
-        elif "/e/" in memory_path or memory_path.startswith("spaces/e"):
-            return "e" 
-        elif "/s/" in memory_path or memory_path.startswith("spaces/s"):
-            return "s"
-        else:
-            return "unknown"
+        found = {inner or leading for inner, leading in MEMORY_SPACE_RE.findall(memory_path)}
+        for space in MEMORY_SPACES:
+            if space in found:
+                return space
+        return "unknown"
     
     def detect_content_type(self, file_path):
         """Detect content type of memory file"""
-        suffix = file_path.suffix.lower()
-        
-        type_map = {
-            '.json': 'structured_data',
-            '.txt': 'text',
-            '.scm': 'scheme_code',
-            '.lisp': 'lisp_code', 
-            '.wl': 'wolfram_code',
-            '.py': 'python_code',
-            '.md': 'markdown',
-            '.log': 'log_data'
-        }
-        
-        return type_map.get(suffix, 'unknown')
+        return CONTENT_TYPES.get(os.path.splitext(file_path)[1].lower(), 'unknown')
     
     def extract_semantic_tags(self, file_path):
-        """Extract semantic tags from file content"""
-        tags = []
+        """Extract semantic tags from file content
+        
+        Symbolic expressions, cognitive keywords and code patterns are all
+        found in one scan, which stops once every tag has been seen.
+        """
+        found = set()
         
         try:
             with open(file_path, 'r') as f:
                 content = f.read()
             
-            # Look for symbolic expressions
-            symbolic_patterns = ['∇', '∂', '⊗', 'Φ', 'Ω', '∑']
-            for pattern in symbolic_patterns:
-                if pattern in content:
-                    tags.append(f"symbolic_{pattern}")
-            
-            # Look for cognitive keywords
-            cognitive_keywords = ['cognitive', 'symbolic', 'memory', 'evolution', 'meta', 'recursive']
-            for keyword in cognitive_keywords:
-                if keyword.lower() in content.lower():
-                    tags.append(f"concept_{keyword}")
-            
-            # Detect code patterns
-            if any(pattern in content for pattern in ['def ', 'define ', 'function']):
-                tags.append("code_definitions")
-            
-            if any(pattern in content for pattern in ['import', 'require', 'use-modules']):
-                tags.append("code_imports")
+            self.scan_semantic_tags(content, found)
                 
         except Exception:
             pass
         
-        return tags
+        return [tag for tag in SEMANTIC_TAG_ORDER if tag in found]
     
-    def save_to_memory_index(self, space, index_entry):
-        """Save index entry to memory index"""
-        index_dir = Path(f"/tmp/wolfcog_memory_index/{space}")
-        index_dir.mkdir(parents=True, exist_ok=True)
+    def scan_semantic_tags(self, text, found):
+        """Add the tags of every pattern in text to the found set"""
+        if len(found) == len(SEMANTIC_TAG_ORDER):
+            return
+        for match in SEMANTIC_TAG_RE.finditer(text):
+            matched = match.group()
+            found.add(SEMANTIC_TAGS.get(matched) or SEMANTIC_TAGS[matched.lower()])
+            if len(found) == len(SEMANTIC_TAG_ORDER):
+                break
+    
+    def load_memory_index(self, space):
+        """Index entries of a space, read from disk on first use
         
-        index_file = index_dir / "index.json"
+        Starts from index.json and replays the index.ndjson log over it.
+        """
+        index_data = self._index_cache.get(space)
+        if index_data is not None:
+            return index_data
         
-        # Load existing index
-        index_data = []
-        if index_file.exists():
-            try:
-                with open(index_file, 'r') as f:
-                    index_data = json.load(f)
-            except:
-                pass
+        index_dir = f"{MEMORY_INDEX_ROOT}/{space}"
+        index_data = OrderedDict()
+        try:
+            with open(f"{index_dir}/index.json", 'rb') as f:
+                for entry in json_loads(f.read()):
+                    self.apply_index_record(index_data, {"op": "add", "entry": entry})
+        except:
+            pass
+        
+        log_lines = 0
+        try:
+            with open(f"{index_dir}/index.ndjson", 'rb') as f:
+                for line in f:
+                    try:
+                        record = json_loads(line)
+                    except ValueError:
+                        continue  # torn final line from an interrupted write
+                    log_lines += 1
+                    self.apply_index_record(index_data, record)
+        except OSError:
+            pass
+        
+        while len(index_data) > MAX_INDEX_ENTRIES:
+            index_data.popitem(last=False)
+        self._index_cache[space] = index_data
+        if log_lines:
+            self._index_logs[space] = [None, log_lines]
+        return index_data
+    
+    def apply_index_record(self, index_data, record):
+        """Apply one index.ndjson record ({"op": "add"|"update", "entry"}) to entries
+        
+        An add makes the path the newest entry; an update keeps its position.
+        """
+        path = record["entry"].get("path")
+        index_data[path] = record["entry"]
+        if record["op"] == "add":
+            index_data.move_to_end(path)
+    
+    def log_index_record(self, space, op, entry):
+        """Append a record to the space's index.ndjson, compacting when it grows long"""
+        log = self._index_logs.setdefault(space, [None, 0])
+        if log[0] is None:
+            log[0] = open(f"{self.get_index_dir(space)}/index.ndjson", 'ab')
         
-        # Add new entry
-        index_data.append(index_entry)
+        log[0].write(json_dumps({"op": op, "entry": entry}) + b"\n")
+        log[0].flush()
+        log[1] += 1
+        if log[1] >= INDEX_COMPACT_LINES:
+            self.compact_memory_index(space)
+    
+    def get_index_dir(self, space):
+        """Index directory of a space, created on first use"""
+        index_dir = f"{MEMORY_INDEX_ROOT}/{space}"
+        if index_dir not in self._message_dirs:
+            os.makedirs(index_dir, exist_ok=True)
+            self._message_dirs.add(index_dir)
+        return index_dir
+    
+    def compact_memory_index(self, space):
+        """Write the cached entries to index.json and start an empty log"""
+        index_data = self._index_cache.get(space)
+        if index_data is None:
+            return
         
-        # Keep only last 1000 entries
-        if len(index_data) > 1000:
-            index_data = index_data[-1000:]
+        index_dir = self.get_index_dir(space)
+        tmp_file = f"{index_dir}/index.json.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(list(index_data.values())))
+        os.replace(tmp_file, f"{index_dir}/index.json")
         
-        # Save updated index
-        with open(index_file, 'w') as f:
-            json.dump(index_data, f, indent=2)
+        log = self._index_logs.pop(space, None)
+        if log is not None and log[0] is not None:
+            log[0].close()
+        try:
+            os.remove(f"{index_dir}/index.ndjson")
+        except FileNotFoundError:
+            pass
+    
+    def save_to_memory_index(self, space, index_entry):
+        """Save index entry to memory index"""
+        with self._index_lock:
+            index_data = self.load_memory_index(space)
+            
+            # Add new entry, keeping only the last MAX_INDEX_ENTRIES
+            self.apply_index_record(index_data, {"op": "add", "entry": index_entry})
+            if len(index_data) > MAX_INDEX_ENTRIES:
+                index_data.popitem(last=False)
+            
+            self.log_index_record(space, "add", index_entry)
     
     def update_memory(self, memory_path):
         """Update existing memory structure"""
-        print(f"🔄 Updating memory: {memory_path}")
+        logger.debug("🔄 Updating memory: %s", memory_path)
         
         try:
-            memory_file = Path(memory_path)
-            
-            if not memory_file.exists():
-                print(f"⚠️ Memory file not found: {memory_path}")
+            try:
+                st = os.stat(memory_path)
+            except FileNotFoundError:
+                logger.warning("⚠️ Memory file not found: %s", memory_path)
                 return
             
             # Find existing index entry
@@ -479,9 +941,10 @@ class ReflexDaemon:
             existing_entry = self.find_memory_index_entry(space, memory_path)
             
             if existing_entry:
-                # Update existing entry
+                # Update a copy, so the cached entry only changes under the index lock
+                existing_entry = dict(existing_entry)
                 existing_entry["last_updated"] = time.time()
-                existing_entry["file_size"] = memory_file.stat().st_size
+                existing_entry["file_size"] = st.st_size
                 existing_entry["file_hash"] = self.calculate_file_hash(memory_path)
                 
                 # Check for content changes
@@ -491,65 +954,43 @@ class ReflexDaemon:
                     existing_entry["previous_hash"] = existing_entry["file_hash"]
                 
                 self.update_memory_index_entry(space, existing_entry)
-                print(f"📊 Memory updated: {space}/{memory_file.name}")
+                self.signal_if_symbolic(existing_entry)
+                logger.info("📊 Memory updated: %s/%s", space, os.path.basename(memory_path))
             else:
                 # Create new index entry if not found
-                print(f"📝 Memory not indexed, creating new entry")
+                logger.debug("📝 Memory not indexed, creating new entry")
                 self.index_memory(memory_path)
                 
         except Exception as e:
-            print(f"❌ Memory update error: {e}")
+            logger.error("❌ Memory update error: %s", e)
     
     def find_memory_index_entry(self, space, memory_path):
         """Find existing memory index entry"""
-        index_file = Path(f"/tmp/wolfcog_memory_index/{space}/index.json")
-        
-        if not index_file.exists():
-            return None
-        
-        try:
-            with open(index_file, 'r') as f:
-                index_data = json.load(f)
-            
-            for entry in index_data:
-                if entry.get("path") == str(memory_path):
-                    return entry
-                    
-        except Exception:
-            pass
-        
-        return None
+        with self._index_lock:
+            return self.load_memory_index(space).get(str(memory_path))
     
     def update_memory_index_entry(self, space, updated_entry):
         """Update an existing memory index entry"""
-        index_file = Path(f"/tmp/wolfcog_memory_index/{space}/index.json")
-        
         try:
-            with open(index_file, 'r') as f:
-                index_data = json.load(f)
-            
-            # Find and update entry
-            for i, entry in enumerate(index_data):
-                if entry.get("path") == updated_entry.get("path"):
-                    index_data[i] = updated_entry
-                    break
-            
-            # Save updated index
-            with open(index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
+            with self._index_lock:
+                index_data = self.load_memory_index(space)
+                self.apply_index_record(index_data, {"op": "update", "entry": updated_entry})
+                self.log_index_record(space, "update", updated_entry)
                 
         except Exception as e:
-            print(f"❌ Error updating memory index: {e}")
+            logger.error("❌ Error updating memory index: %s", e)
     
-    def notify_scheduler(self, task_path):
-        """Notify scheduler of new task"""
-        print(f"📨 Notifying scheduler: {task_path}")
+    def notify_scheduler(self, task_path, task_data=None):
+        """Notify scheduler of new task
+        
+        task_data is the task file's content when already parsed on creation;
+        otherwise the file is read here.
+        """
+        logger.debug("📨 Notifying scheduler: %s", task_path)
         
         try:
-            task_file = Path(task_path)
-            
-            if not task_file.exists():
-                print(f"⚠️ Task file not found: {task_path}")
+            if not os.path.exists(task_path):
+                logger.warning("⚠️ Task file not found: %s", task_path)
                 return
             
             # Create scheduler notification
@@ -563,8 +1004,9 @@ class ReflexDaemon:
             
             # Try to read task details
             try:
-                with open(task_file, 'r') as f:
-                    task_data = json.load(f)
+                if task_data is None:
+                    with open(task_path, 'rb') as f:
+                        task_data = json_loads(f.read())
                 notification["task_summary"] = {
                     "flow": task_data.get("flow", "unknown"),
                     "space": task_data.get("space", "e"),
@@ -574,17 +1016,12 @@ class ReflexDaemon:
                 notification["task_summary"] = {"status": "unreadable"}
             
             # Send notification to scheduler
-            notifications_dir = Path("/tmp/scheduler_notifications")
-            notifications_dir.mkdir(exist_ok=True)
-            
-            notification_file = notifications_dir / f"notify_{int(time.time())}.json"
-            with open(notification_file, 'w') as f:
-                json.dump(notification, f, indent=2)
+            self.write_message(NOTIFICATIONS_DIR, f"notify_{int(time.time())}", ".json", notification)
             
-            print(f"📧 Scheduler notification sent: {notification['priority']} priority")
+            logger.info("📧 Scheduler notification sent: %s priority", notification['priority'])
             
         except Exception as e:
-            print(f"❌ Scheduler notification error: {e}")
+            logger.error("❌ Scheduler notification error: %s", e)
     
     def calculate_task_priority_from_path(self, task_path):
         """Calculate task priority based on file path and name"""
@@ -599,11 +1036,10 @@ class ReflexDaemon:
     
     def restart_agent(self, agent_path):
         """Restart modified agent"""
-        print(f"🔄 Restarting agent: {agent_path}")
+        logger.debug("🔄 Restarting agent: %s", agent_path)
         
         try:
-            agent_file = Path(agent_path)
-            agent_name = agent_file.stem
+            agent_name = os.path.splitext(os.path.basename(agent_path))[0]
             
             # Create restart command
             restart_command = {
@@ -618,37 +1054,70 @@ class ReflexDaemon:
             if self.is_agent_running(agent_name):
                 restart_command["was_running"] = True
                 restart_command["action"] = "restart"
-                print(f"🔄 Agent {agent_name} is running, scheduling restart")
+                logger.debug("🔄 Agent %s is running, scheduling restart", agent_name)
             else:
                 restart_command["was_running"] = False
                 restart_command["action"] = "start"
-                print(f"▶️ Agent {agent_name} not running, scheduling start")
+                logger.debug("▶️ Agent %s not running, scheduling start", agent_name)
             
             # Send restart command to coordinator
-            commands_dir = Path("/tmp/coordinator_commands")
-            commands_dir.mkdir(exist_ok=True)
-            
-            command_file = commands_dir / f"restart_{agent_name}_{int(time.time())}.json"
-            with open(command_file, 'w') as f:
-                json.dump(restart_command, f, indent=2)
+            self.write_message(COMMANDS_DIR, f"restart_{agent_name}_{int(time.time())}", ".json",
+                               restart_command)
             
-            print(f"📋 Agent restart command queued: {agent_name}")
+            logger.info("📋 Agent restart command queued: %s", agent_name)
             
         except Exception as e:
-            print(f"❌ Agent restart error: {e}")
+            logger.error("❌ Agent restart error: %s", e)
     
     def is_agent_running(self, agent_name):
         """Check if an agent is currently running"""
+        return f"{agent_name}.py" in self.get_running_scripts()
+    
+    def get_running_scripts(self):
+        """Basenames of the programs and scripts of all processes, from /proc
+        
+        For each process this is argv[0] and its first non-option argument (the
+        script run by an interpreter). A scan is reused for AGENT_SCAN_TTL, so a
+        burst of restarts shares one pass over /proc.
+        """
+        scanned_at, scripts = self._running_scripts
+        now = time.monotonic()
+        if scanned_at is not None and now - scanned_at < AGENT_SCAN_TTL:
+            return scripts
+        
+        names = set()
         try:
-            import subprocess
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            return f"{agent_name}.py" in result.stdout
-        except:
-            return False
+            pids = [name for name in os.listdir('/proc') if name.isdigit()]
+        except OSError:
+            pids = []
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                    argv = f.read().rstrip(b"\0").split(b"\0")
+            except OSError:
+                continue  # process exited mid-scan
+            names.add(os.path.basename(argv[0]).decode(errors="replace"))
+            for arg in argv[1:]:
+                if not arg.startswith(b"-"):
+                    names.add(os.path.basename(arg).decode(errors="replace"))
+                    break
+        
+        scripts = frozenset(names)
+        self._running_scripts = (now, scripts)
+        return scripts
     
     def monitor_symbolic_changes(self):
-        """Monitor symbolic changes in the system"""
+        """Monitor symbolic changes in the system
+        
+        Runs the checks whenever memory indexing sees symbolic content, and
+        sleeps otherwise.
+        """
         while self.running:
+            self._symbolic_event.wait()
+            self._symbolic_event.clear()
+            if not self.running:
+                break
+            
             try:
                 # Monitor for symbolic self-modifications
                 self.check_symbolic_mutations()
@@ -657,9 +1126,7 @@ class ReflexDaemon:
                 self.check_recursive_modifications()
                 
             except Exception as e:
-                print(f"❌ Symbolic monitoring error: {e}")
-            
-            time.sleep(5)  # Symbolic monitoring every 5 seconds
+                logger.error("❌ Symbolic monitoring error: %s", e)
     
     def check_symbolic_mutations(self):
         """Check for symbolic mutations in the system"""
@@ -677,19 +1144,39 @@ class ReflexDaemon:
             "running": self.running,
             "monitored_paths": len(self.watch_paths),
             "tracked_files": len(self.file_states),
-            "pending_responses": len(self.response_queue),
-            "total_reactions": len(self.reactions)
+            "pending_responses": self.response_queue.qsize(),
+            "total_reactions": self.total_reactions
         }
     
     def stop(self):
         """Stop the reflex daemon"""
-        print("🛑 Stopping Reflex Daemon...")
+        logger.info("🛑 Stopping Reflex Daemon...")
         self.running = False
+        self._pending_event.set()
+        self._symbolic_event.set()
+        
+        # Stop the observer
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        
+        # Let queued indexing finish before the index is compacted
+        for worker in self.index_workers:
+            worker.shutdown(wait=True)
+        
+        try:
+            self.save_hash_cache()
+        except Exception as e:
+            logger.error("❌ Error saving hash cache: %s", e)
         
-        # Stop all observers
-        for observer in self.observers:
-            observer.stop()
-            observer.join()
+        # Fold the index logs into index.json for the next start
+        with self._index_lock:
+            for space in list(self._index_cache):
+                try:
+                    self.compact_memory_index(space)
+                except Exception as e:
+                    logger.error("❌ Error compacting memory index: %s", e)
 
 if __name__ == "__main__":
     # Install watchdog if not available
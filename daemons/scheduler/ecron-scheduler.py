@@ -4,25 +4,181 @@ Scheduler Daemon - Main scheduling engine for WolfCog AGI-OS
 Runs ecron and schedules symbolic flows across the AGI system
 """
 
+import asyncio
+import os
 import time
 import threading
 import subprocess
 import json
-from pathlib import Path
+import itertools
+import queue
+import sched
+from collections import deque
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+# Prefer orjson for the inbox and status files when installed
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    def json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+    
+    def json_loads(data):
+        return json.loads(data)
+
+# Inbox directories other components drop JSON files into
+TASKS_DIR = "/tmp/ecron_tasks"
+SIGNALS_DIR = "/tmp/wolfcog_signals"
+AGENT_REQUESTS_DIR = "/tmp/agent_requests"
+NOTIFICATIONS_DIR = "/tmp/scheduler_notifications"
+INBOX_DIRS = (TASKS_DIR, SIGNALS_DIR, AGENT_REQUESTS_DIR, NOTIFICATIONS_DIR)
+COG_COMMANDS_DIR = "/tmp/cogserver_commands"
+# Latest scheduler status, rewritten in place rather than one file per update
+SCHEDULER_STATUS_NAME = "scheduler_status.json"
+SCHEDULER_STATUS_FILE = f"{COG_COMMANDS_DIR}/{SCHEDULER_STATUS_NAME}"
+DEPENDENCIES_FILE = f"{TASKS_DIR}/dependencies.json"
+
+# Inbox files are small; most fit in one read of this size
+INBOX_READ_SIZE = 1 << 16
+
+def read_json_file(file_path):
+    """Load a JSON inbox file with raw reads, skipping the buffered file object"""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        chunks = [os.read(fd, INBOX_READ_SIZE)]
+        while len(chunks[-1]) == INBOX_READ_SIZE:
+            chunks.append(os.read(fd, INBOX_READ_SIZE))
+    finally:
+        os.close(fd)
+    return json_loads(b"".join(chunks))
+
+# Queued tasks older than this are raised one priority level, and again
+# every TASK_AGING_INTERVAL seconds until they reach priority 1
+TASK_AGING_AGE = 60
+TASK_AGING_INTERVAL = 10
+
+# Tasks executing at once; the rest wait in the priority shards
+EXECUTION_SLOTS = os.cpu_count() or 4
+
+def scan_json_files(directory, prefix=""):
+    """Paths of the JSON files in a directory whose names start with prefix"""
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.path for entry in entries
+                    if entry.name.endswith(".json") and entry.name.startswith(prefix)]
+    except FileNotFoundError:
+        return []
+
+def task_search_blob(value):
+    """Every leaf value of a task's data, one per line, for substring matching"""
+    if isinstance(value, dict):
+        return "\n".join(task_search_blob(v) for v in value.values())
+    if isinstance(value, list):
+        return "\n".join(task_search_blob(v) for v in value)
+    return str(value)
+
+def iter_task_tokens(value, key=None):
+    """Exact-match keys for a task's data: every string value, "<key>_<value>"
+    for keyed strings, and the basename and stem of path-like values"""
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from iter_task_tokens(v, k)
+    elif isinstance(value, list):
+        for v in value:
+            yield from iter_task_tokens(v, key)
+    elif isinstance(value, str):
+        yield value
+        if key is not None:
+            yield f"{key}_{value}"
+        if "/" in value:
+            name = os.path.basename(value)
+            yield name
+            yield os.path.splitext(name)[0]
+
+def task_tokens(task_data, task_file=None):
+    """Index tokens of a task: those of its data, plus its file's name and stem"""
+    tokens = set(iter_task_tokens(task_data))
+    if task_file is not None:
+        name = os.path.basename(task_file)
+        tokens.update((name, os.path.splitext(name)[0]))
+    return frozenset(tokens)
+
+class InboxEventHandler(FileSystemEventHandler):
+    def __init__(self, inbox):
+        self.inbox = inbox
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self.inbox.put(event.src_path)
+    
+    def on_closed(self, event):
+        # Writers create the file before filling it; it is complete once closed
+        if not event.is_directory:
+            self.inbox.put(event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.inbox.put(event.dest_path)
+    
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.inbox.put(event.src_path)
 
 class SchedulerDaemon:
     def __init__(self):
         self.running = False
         self.ecron_process = None
-        self.task_queue = []
+        # Create the directories up front so the cycles need no exists() checks
+        for directory in INBOX_DIRS + (COG_COMMANDS_DIR,):
+            os.makedirs(directory, exist_ok=True)
+        # One FIFO shard of (sequence, task) per priority level. A task whose
+        # "queue_seq" no longer matches its entry's sequence was requeued or
+        # popped, and the entry is skipped.
+        self.task_shards = {}
+        self.queued_count = 0
+        self.shard_entries = 0
+        self.queue_sequence = itertools.count()
+        self.task_ids = itertools.count()
+        # Token -> {task_id: task} for queued tasks; see iter_task_tokens
+        self.task_index = {}
+        # Queued tasks per execution space, {task_id: task} in queueing order
+        self.space_tasks = {'u': {}, 'e': {}, 's': {}}
+        # Aging events for queued tasks, run by manage_priorities when due
+        self.age_wheel = sched.scheduler(time.monotonic, time.sleep)
         self.active_flows = {}
-        self.priorities = {}
+        # Executing tasks are coroutines on one event loop thread
+        self.execution_loop = asyncio.new_event_loop()
+        threading.Thread(target=self.execution_loop.run_forever, daemon=True).start()
+        # Task file -> mtime when it was scheduled, so a rescan does not queue it again
+        self.scheduled_files = {}
+        self.observer = None  # watches INBOX_DIRS; without it they are polled
+        self.inbox = queue.Queue()
+        self._task_arrived = threading.Event()
+        self._shutdown = threading.Event()
+        # Held by each thread for a whole pass over the queue and flows
+        self._lock = threading.RLock()
         
     def start(self):
         """Start the scheduler daemon"""
         print("⏰ Starting Scheduler Daemon...")
         self.running = True
         
+        if WATCHDOG_AVAILABLE:
+            self.start_inbox_watcher()
+        
         # Start ecron scheduler thread
         ecron_thread = threading.Thread(target=self.run_ecron_scheduler)
         ecron_thread.daemon = True
@@ -40,41 +196,116 @@ class SchedulerDaemon:
         
         print("📅 Scheduler Daemon managing symbolic flows...")
     
+    def start_inbox_watcher(self):
+        """Watch the inbox directories and dispatch files as they land"""
+        event_handler = InboxEventHandler(self.inbox)
+        self.observer = Observer()
+        
+        for inbox_dir in INBOX_DIRS:
+            self.observer.schedule(event_handler, str(inbox_dir), recursive=False)
+        
+        self.observer.start()
+        
+        watch_thread = threading.Thread(target=self.watch_inboxes)
+        watch_thread.daemon = True
+        watch_thread.start()
+    
+    def watch_inboxes(self):
+        """Dispatch inbox files reported by the watcher"""
+        # Pick up whatever arrived before the watch was in place
+        with self._lock:
+            self.process_symbolic_tasks()
+            self.process_coordination_signals()
+            self.coordinate_with_agents()
+            self.coordinate_with_reflex_daemon()
+        
+        while self.running:
+            # Drain everything pending; a file usually reports both created and
+            # closed, and is handled once per batch
+            batch = [self.inbox.get()]
+            while True:
+                try:
+                    batch.append(self.inbox.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for file_path in dict.fromkeys(batch):
+                if file_path is None:
+                    return
+                
+                try:
+                    with self._lock:
+                        self.dispatch_inbox_file(file_path)
+                except Exception as e:
+                    print(f"⚠️ Error dispatching {file_path}: {e}")
+    
+    def dispatch_inbox_file(self, file_path):
+        """Hand one inbox file to the handler for its directory"""
+        if not file_path.endswith(".json"):
+            return
+        
+        # Deleted files reach the ingest methods too, which skip them
+        inbox_dir, name = os.path.split(file_path)
+        if inbox_dir == TASKS_DIR:
+            self.ingest_task_file(file_path)
+        elif inbox_dir == SIGNALS_DIR and name.startswith("signal_"):
+            self.ingest_signal_file(file_path)
+        elif inbox_dir == AGENT_REQUESTS_DIR:
+            self.ingest_agent_request(file_path)
+        elif inbox_dir == NOTIFICATIONS_DIR and name.startswith("notify_"):
+            self.ingest_reflex_notification(file_path)
+    
     def run_ecron_scheduler(self):
         """Run the ecron symbolic scheduler"""
         while self.running:
             try:
                 print("🔄 Running Ecron symbolic scheduler cycle...")
                 
-                # Simulate ecron execution (in real implementation would call Wolfram)
-                self.process_symbolic_tasks()
-                
-                # Check for new tasks from ecron output
-                self.collect_scheduled_tasks()
+                with self._lock:
+                    # Simulate ecron execution (in real implementation would call Wolfram)
+                    if self.observer is None:
+                        self.process_symbolic_tasks()
+                    
+                    # Check for new tasks from ecron output
+                    self.collect_scheduled_tasks()
                 
             except Exception as e:
                 print(f"❌ Ecron scheduler error: {e}")
             
-            time.sleep(5)  # Scheduler cycle every 5 seconds
+            # Scheduler cycle every 5 seconds, or as soon as a task arrives
+            self._task_arrived.wait(timeout=5)
+            self._task_arrived.clear()
     
     def process_symbolic_tasks(self):
         """Process symbolic tasks through ecron"""
-        task_path = Path("/tmp/ecron_tasks")
-        if task_path.exists():
-            for task_file in task_path.glob("*.json"):
-                try:
-                    with open(task_file, 'r') as f:
-                        task_data = json.load(f)
-                    
-                    # Schedule the task
-                    self.schedule_task(task_data)
-                    
-                except Exception as e:
-                    print(f"❌ Error processing task {task_file}: {e}")
+        task_files = set(scan_json_files(TASKS_DIR))
+        for task_file in task_files:
+            self.ingest_task_file(task_file)
+        
+        # Forget files that have gone away
+        self.scheduled_files = {f: mtime for f, mtime in self.scheduled_files.items() if f in task_files}
     
-    def schedule_task(self, task_data):
+    def ingest_task_file(self, task_file):
+        """Schedule the task in a file, unless it was already scheduled unchanged"""
+        try:
+            mtime = os.stat(task_file).st_mtime_ns
+            if self.scheduled_files.get(task_file) == mtime:
+                return
+            
+            task_data = read_json_file(task_file)
+            
+            # Schedule the task
+            self.scheduled_files[task_file] = mtime
+            self.schedule_task(task_data, task_file)
+            
+        except FileNotFoundError:
+            self.scheduled_files.pop(task_file, None)
+        except Exception as e:
+            print(f"❌ Error processing task {task_file}: {e}")
+    
+    def schedule_task(self, task_data, task_file=None):
         """Schedule a symbolic task"""
-        task_id = f"task_{len(self.task_queue)}"
+        task_id = f"task_{next(self.task_ids)}"
         priority = self.calculate_priority(task_data)
         
         scheduled_task = {
@@ -82,13 +313,101 @@ class SchedulerDaemon:
             "data": task_data,
             "priority": priority,
             "scheduled_time": time.time(),
-            "status": "scheduled"
+            "status": "scheduled",
+            "task_file": task_file,
+            "tokens": task_tokens(task_data, task_file),
+            "search_blob": task_search_blob(task_data)
         }
         
-        self.task_queue.append(scheduled_task)
-        self.priorities[task_id] = priority
+        self.push_task(scheduled_task)
         
         print(f"📋 Scheduled task {task_id} with priority {priority}")
+        self._task_arrived.set()
+    
+    def push_task(self, task):
+        """Queue a task, or move it to its current priority if already queued"""
+        if task.get("queue_seq") is None:
+            self.queued_count += 1
+            for token in task["tokens"]:
+                self.task_index.setdefault(token, {})[task["id"]] = task
+            space_tasks = self.space_tasks.get(task["data"].get("space", "e"))
+            if space_tasks is not None:
+                space_tasks[task["id"]] = task
+            if not task.get("aging"):
+                task["aging"] = True
+                delay = max(0, task["scheduled_time"] + TASK_AGING_AGE - time.time())
+                self.age_wheel.enter(delay, 1, self.age_task, (task,))
+        seq = next(self.queue_sequence)
+        task["queue_seq"] = seq
+        shard = self.task_shards.get(task["priority"])
+        if shard is None:
+            shard = self.task_shards[task["priority"]] = deque()
+        shard.append((seq, task))
+        self.shard_entries += 1
+        
+        # Requeued tasks leave stale entries behind; drop them once they dominate
+        if self.shard_entries > 2 * self.queued_count + 64:
+            for priority in list(self.task_shards):
+                live = deque(entry for entry in self.task_shards[priority] if entry[1]["queue_seq"] == entry[0])
+                if live:
+                    self.task_shards[priority] = live
+                else:
+                    del self.task_shards[priority]
+            self.shard_entries = self.queued_count
+    
+    def set_task_priority(self, task, priority):
+        """Move a queued task to the shard for its new priority"""
+        task["priority"] = priority
+        self.push_task(task)
+    
+    def peek_task(self):
+        """Queued task with the lowest priority number, or None"""
+        for priority in sorted(self.task_shards):
+            shard = self.task_shards[priority]
+            while shard:
+                seq, task = shard[0]
+                if task["queue_seq"] == seq:
+                    return task
+                shard.popleft()
+                self.shard_entries -= 1
+            del self.task_shards[priority]
+        return None
+    
+    def pop_task(self):
+        """Remove and return the queued task with the lowest priority number, or None"""
+        task = self.peek_task()
+        if task is not None:
+            self.task_shards[task["priority"]].popleft()
+            self.shard_entries -= 1
+            task["queue_seq"] = None
+            self.queued_count -= 1
+            for token in task["tokens"]:
+                matches = self.task_index[token]
+                del matches[task["id"]]
+                if not matches:
+                    del self.task_index[token]
+            space_tasks = self.space_tasks.get(task["data"].get("space", "e"))
+            if space_tasks is not None:
+                del space_tasks[task["id"]]
+        return task
+    
+    def tasks_matching(self, token):
+        """Queued tasks carrying a token, such as a kernel, flow or file name
+        
+        Tasks whose data contains the token as a substring match too, whether or
+        not another task carries it exactly.
+        """
+        matches = self.task_index.get(token) or {}
+        if not isinstance(token, str) or not token:
+            return list(matches.values())
+        
+        return [task for task in self.queued_tasks()
+                if task["id"] in matches or token in task["search_blob"]]
+    
+    def queued_tasks(self):
+        """Tasks currently queued, in priority order"""
+        return [task for priority in sorted(self.task_shards)
+                for seq, task in self.task_shards[priority] if task["queue_seq"] == seq]
     
     def calculate_priority(self, task_data):
         """Calculate task priority based on space and type"""
@@ -110,13 +429,14 @@ class SchedulerDaemon:
     
     def collect_scheduled_tasks(self):
         """Collect tasks that have been scheduled by ecron"""
-        # Sort tasks by priority
-        self.task_queue.sort(key=lambda x: x["priority"])
-        
-        # Process high priority tasks first
-        while self.task_queue and self.task_queue[0]["priority"] <= 2:
-            task = self.task_queue.pop(0)
-            self.execute_task(task)
+        # Process high priority tasks first, in priority order. Tasks are handed
+        # over only while a slot is free, so waiting work stays in the shards
+        # where later, more urgent tasks can still overtake it
+        while len(self.active_flows) < EXECUTION_SLOTS:
+            task = self.peek_task()
+            if task is None or task["priority"] > 2:
+                break
+            self.execute_task(self.pop_task())
     
     def execute_task(self, task):
         """Execute a scheduled task"""
@@ -130,42 +450,45 @@ class SchedulerDaemon:
         self.active_flows[task_id] = task
         
         # Simulate task execution
-        execution_thread = threading.Thread(target=self.simulate_execution, args=(task,))
-        execution_thread.daemon = True
-        execution_thread.start()
+        asyncio.run_coroutine_threadsafe(self.simulate_execution(task), self.execution_loop)
     
-    def simulate_execution(self, task):
+    async def simulate_execution(self, task):
         """Simulate task execution"""
         task_id = task["id"]
         
         # Simulate variable execution time based on complexity
         execution_time = 1 + (task["priority"] * 0.5)
-        time.sleep(execution_time)
+        await asyncio.sleep(execution_time)
         
-        # Mark as completed
-        task["status"] = "completed"
-        task["completion_time"] = time.time()
-        
-        print(f"✅ Completed task: {task_id}")
+        with self._lock:
+            # Mark as completed
+            task["status"] = "completed"
+            task["completion_time"] = time.time()
+            
+            print(f"✅ Completed task: {task_id}")
+            
+            # Remove from active flows
+            if task_id in self.active_flows:
+                del self.active_flows[task_id]
         
-        # Remove from active flows
-        if task_id in self.active_flows:
-            del self.active_flows[task_id]
+        # A slot is free for the next queued task
+        self._task_arrived.set()
     
     def manage_flows(self):
         """Manage symbolic flow coordination"""
         while self.running:
             try:
-                # Monitor active flows
-                self.monitor_active_flows()
-                
-                # Coordinate with other daemons
-                self.coordinate_flows()
+                with self._lock:
+                    # Monitor active flows
+                    self.monitor_active_flows()
+                    
+                    # Coordinate with other daemons
+                    self.coordinate_flows()
                 
             except Exception as e:
                 print(f"❌ Flow management error: {e}")
             
-            time.sleep(3)  # Flow management cycle every 3 seconds
+            self._shutdown.wait(3)  # Flow management cycle every 3 seconds
     
     def monitor_active_flows(self):
         """Monitor active symbolic flows"""
@@ -189,54 +512,56 @@ class SchedulerDaemon:
             task["status"] = "stalled"
             
             # Reschedule with lower priority
-            task["priority"] += 1
-            self.task_queue.append(task)
+            self.set_task_priority(task, task["priority"] + 1)
             
             del self.active_flows[task_id]
     
     def coordinate_flows(self):
         """Coordinate flows with other system components"""
+        # Nothing queued or running, and the watcher handles new arrivals
+        if self.observer is not None and not self.queued_count and not self.active_flows:
+            return
+        
         try:
-            # Check for coordination signals from other daemons
-            self.process_coordination_signals()
-            
             # Coordinate with OpenCog AtomSpace
             self.coordinate_with_cogserver()
             
-            # Coordinate with agent systems
-            self.coordinate_with_agents()
-            
-            # Coordinate with reflex daemon
-            self.coordinate_with_reflex_daemon()
+            # Signals, agent requests and reflex notifications are dispatched
+            # as they arrive while the inbox watcher runs
+            if self.observer is None:
+                self.process_coordination_signals()
+                self.coordinate_with_agents()
+                self.coordinate_with_reflex_daemon()
             
         except Exception as e:
             print(f"❌ Flow coordination error: {e}")
     
     def process_coordination_signals(self):
         """Process coordination signals from other components"""
-        signals_dir = Path("/tmp/wolfcog_signals")
-        if not signals_dir.exists():
-            return
-        
-        for signal_file in signals_dir.glob("signal_*.json"):
-            try:
-                with open(signal_file, 'r') as f:
-                    signal_data = json.load(f)
-                
-                signal_type = signal_data.get("type")
-                
-                if signal_type == "kernel_reload":
-                    self.handle_kernel_reload_signal(signal_data)
-                elif signal_type == "priority_change":
-                    self.handle_priority_change_signal(signal_data)
-                elif signal_type == "flow_optimization":
-                    self.handle_flow_optimization_signal(signal_data)
-                
-                # Remove processed signal
-                signal_file.unlink()
-                
-            except Exception as e:
-                print(f"⚠️ Error processing signal {signal_file}: {e}")
+        for signal_file in scan_json_files(SIGNALS_DIR, "signal_"):
+            self.ingest_signal_file(signal_file)
+    
+    def ingest_signal_file(self, signal_file):
+        """Handle and remove one coordination signal file"""
+        try:
+            signal_data = read_json_file(signal_file)
+            
+            signal_type = signal_data.get("type")
+            
+            if signal_type == "kernel_reload":
+                self.handle_kernel_reload_signal(signal_data)
+            elif signal_type == "priority_change":
+                self.handle_priority_change_signal(signal_data)
+            elif signal_type == "flow_optimization":
+                self.handle_flow_optimization_signal(signal_data)
+            
+            # Remove processed signal
+            os.unlink(signal_file)
+            
+        except FileNotFoundError:
+            pass  # already handled
+        except Exception as e:
+            print(f"⚠️ Error processing signal {signal_file}: {e}")
     
     def handle_kernel_reload_signal(self, signal_data):
         """Handle kernel reload signal"""
@@ -245,11 +570,9 @@ class SchedulerDaemon:
         
         # Pause tasks that depend on this kernel
         affected_tasks = []
-        for task in self.task_queue:
-            task_data = task.get("data", {})
-            if kernel_name in str(task_data):
-                task["status"] = "paused_for_kernel_reload"
-                affected_tasks.append(task)
+        for task in self.tasks_matching(kernel_name):
+            task["status"] = "paused_for_kernel_reload"
+            affected_tasks.append(task)
         
         print(f"⏸️ Paused {len(affected_tasks)} tasks for kernel reload")
     
@@ -259,10 +582,9 @@ class SchedulerDaemon:
         new_priority = signal_data.get("priority", 2)
         
         updated_count = 0
-        for task in self.task_queue:
-            if task_pattern in str(task.get("data", {})):
-                task["priority"] = new_priority
-                updated_count += 1
+        for task in self.tasks_matching(task_pattern):
+            self.set_task_priority(task, new_priority)
+            updated_count += 1
         
         print(f"⚡ Updated priority for {updated_count} tasks")
     
@@ -280,11 +602,9 @@ class SchedulerDaemon:
     def coordinate_with_cogserver(self):
         """Coordinate task flows with OpenCog CogServer"""
         # Check for CogServer command responses
-        cog_commands_dir = Path("/tmp/cogserver_commands")
-        if cog_commands_dir.exists():
-            processed_commands = len(list(cog_commands_dir.glob("*.json")))
-            if processed_commands > 0:
-                print(f"🧠 CogServer coordination: {processed_commands} commands pending")
+        processed_commands = sum(1 for f in scan_json_files(COG_COMMANDS_DIR) if f != SCHEDULER_STATUS_FILE)
+        if processed_commands > 0:
+            print(f"🧠 CogServer coordination: {processed_commands} commands pending")
         
         # Send scheduler status to CogServer
         if len(self.active_flows) > 0:
@@ -294,34 +614,35 @@ class SchedulerDaemon:
         """Send scheduler status to CogServer"""
         status_data = {
             "active_flows": len(self.active_flows),
-            "queued_tasks": len(self.task_queue),
+            "queued_tasks": self.queued_count,
             "timestamp": time.time(),
             "scheduler_status": "active"
         }
         
-        # Create CogServer status command
-        cog_commands_dir = Path("/tmp/cogserver_commands")
-        cog_commands_dir.mkdir(exist_ok=True)
-        
-        status_file = cog_commands_dir / f"scheduler_status_{int(time.time())}.json"
-        with open(status_file, 'w') as f:
-            json.dump(status_data, f, indent=2)
+        # Replace the CogServer status atomically so readers never see a partial file
+        tmp_file = f"{COG_COMMANDS_DIR}/.{SCHEDULER_STATUS_NAME}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(status_data))
+        os.replace(tmp_file, SCHEDULER_STATUS_FILE)
     
     def coordinate_with_agents(self):
         """Coordinate with agent systems"""
         # Check for agent coordination requests
-        agent_requests_dir = Path("/tmp/agent_requests")
-        if agent_requests_dir.exists():
-            for request_file in agent_requests_dir.glob("*.json"):
-                try:
-                    with open(request_file, 'r') as f:
-                        request_data = json.load(f)
-                    
-                    self.handle_agent_request(request_data)
-                    request_file.unlink()
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing agent request: {e}")
+        for request_file in scan_json_files(AGENT_REQUESTS_DIR):
+            self.ingest_agent_request(request_file)
+    
+    def ingest_agent_request(self, request_file):
+        """Handle and remove one agent request file"""
+        try:
+            request_data = read_json_file(request_file)
+            
+            self.handle_agent_request(request_data)
+            os.unlink(request_file)
+            
+        except FileNotFoundError:
+            pass  # already handled
+        except Exception as e:
+            print(f"⚠️ Error processing agent request: {e}")
     
     def handle_agent_request(self, request_data):
         """Handle coordination request from agents"""
@@ -339,10 +660,9 @@ class SchedulerDaemon:
     def boost_task_priority(self, task_pattern):
         """Boost priority of tasks matching pattern"""
         boosted_count = 0
-        for task in self.task_queue:
-            if task_pattern in str(task.get("data", {})):
-                task["priority"] = max(1, task["priority"] - 1)
-                boosted_count += 1
+        for task in self.tasks_matching(task_pattern):
+            self.set_task_priority(task, max(1, task["priority"] - 1))
+            boosted_count += 1
         
         print(f"⚡ Boosted priority for {boosted_count} tasks")
     
@@ -359,13 +679,7 @@ class SchedulerDaemon:
     
     def balance_task_load(self):
         """Balance task load across different execution contexts"""
-        # Group tasks by space
-        space_groups = {'u': [], 'e': [], 's': []}
-        
-        for task in self.task_queue:
-            space = task.get("data", {}).get("space", "e")
-            if space in space_groups:
-                space_groups[space].append(task)
+        space_groups = self.space_tasks
         
         # Rebalance if one space is overloaded
         max_space = max(space_groups.keys(), key=lambda k: len(space_groups[k]))
@@ -373,27 +687,50 @@ class SchedulerDaemon:
         
         if len(space_groups[max_space]) > len(space_groups[min_space]) + 3:
             # Move some tasks to balance load
-            tasks_to_move = space_groups[max_space][:2]
+            tasks_to_move = list(itertools.islice(space_groups[max_space].values(), 2))
             for task in tasks_to_move:
-                task["data"]["space"] = min_space
+                self.move_task_space(task, min_space)
             
             print(f"⚖️ Balanced load: moved 2 tasks from {max_space} to {min_space}")
     
+    def move_task_space(self, task, space):
+        """Reassign a queued task to another execution space"""
+        old_space = task["data"].get("space", "e")
+        del self.space_tasks[old_space][task["id"]]
+        self.space_tasks[space][task["id"]] = task
+        task["data"]["space"] = space
+        task["search_blob"] = task_search_blob(task["data"])
+        
+        # Re-derive the tokens, so both the bare space value and space_<x> follow
+        # the move unless another field still carries them
+        tokens = task_tokens(task["data"], task.get("task_file"))
+        for token in task["tokens"] - tokens:
+            matches = self.task_index[token]
+            del matches[task["id"]]
+            if not matches:
+                del self.task_index[token]
+        for token in tokens - task["tokens"]:
+            self.task_index.setdefault(token, {})[task["id"]] = task
+        task["tokens"] = tokens
+    
     def coordinate_with_reflex_daemon(self):
         """Coordinate with reflex daemon"""
         # Check for reflex notifications
-        notifications_dir = Path("/tmp/scheduler_notifications")
-        if notifications_dir.exists():
-            for notification_file in notifications_dir.glob("notify_*.json"):
-                try:
-                    with open(notification_file, 'r') as f:
-                        notification_data = json.load(f)
-                    
-                    self.handle_reflex_notification(notification_data)
-                    notification_file.unlink()
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing reflex notification: {e}")
+        for notification_file in scan_json_files(NOTIFICATIONS_DIR, "notify_"):
+            self.ingest_reflex_notification(notification_file)
+    
+    def ingest_reflex_notification(self, notification_file):
+        """Handle and remove one reflex notification file"""
+        try:
+            notification_data = read_json_file(notification_file)
+            
+            self.handle_reflex_notification(notification_data)
+            os.unlink(notification_file)
+            
+        except FileNotFoundError:
+            pass  # already handled
+        except Exception as e:
+            print(f"⚠️ Error processing reflex notification: {e}")
     
     def handle_reflex_notification(self, notification_data):
         """Handle notification from reflex daemon"""
@@ -408,53 +745,57 @@ class SchedulerDaemon:
             # Adjust scheduling based on reflex priority
             if priority == "high":
                 self.expedite_task_processing(task_path)
+            
+            # Pick the task file up now rather than on the next cycle
+            self._task_arrived.set()
     
     def expedite_task_processing(self, task_path):
         """Expedite processing of a specific task"""
-        task_name = Path(task_path).name
+        task_name = os.path.basename(task_path)
         
         # Find matching tasks in queue and boost priority
-        for task in self.task_queue:
-            if task_name in str(task.get("data", {})):
-                task["priority"] = 1  # Highest priority
-                print(f"⚡ Expedited task: {task_name}")
-                break
+        for task in self.tasks_matching(task_name):
+            self.set_task_priority(task, 1)  # Highest priority
+            print(f"⚡ Expedited task: {task_name}")
+            break
     
     def manage_priorities(self):
         """Manage task priorities and dependencies"""
+        next_resolve = time.monotonic()
         while self.running:
+            next_aging = None
             try:
-                # Adjust priorities based on system state
-                self.adjust_priorities()
-                
-                # Handle dependencies
-                self.resolve_dependencies()
+                with self._lock:
+                    # Age the tasks that are due
+                    next_aging = self.age_wheel.run(blocking=False)
+                    
+                    # Handle dependencies every 10 seconds
+                    if time.monotonic() >= next_resolve:
+                        self.resolve_dependencies()
+                        next_resolve = time.monotonic() + 10
                 
             except Exception as e:
                 print(f"❌ Priority management error: {e}")
             
-            time.sleep(10)  # Priority adjustment every 10 seconds
-    
-    def adjust_priorities(self):
-        """Adjust task priorities based on system state"""
-        # Increase priority of old tasks
-        current_time = time.time()
-        for task in self.task_queue:
-            age = current_time - task["scheduled_time"]
-            if age > 60:  # Tasks older than 1 minute
-                task["priority"] = max(1, task["priority"] - 1)
-                print(f"⬆️ Increased priority for aged task: {task['id']}")
+            delay = next_resolve - time.monotonic()
+            if next_aging is not None:
+                delay = min(delay, next_aging)
+            self._shutdown.wait(max(0, delay))
+    
+    def age_task(self, task):
+        """Raise the priority of a task that has waited too long"""
+        if task["queue_seq"] is None or task["priority"] <= 1:
+            task["aging"] = False  # left the queue, or nothing left to raise
+            return
+        
+        self.set_task_priority(task, task["priority"] - 1)
+        print(f"⬆️ Increased priority for aged task: {task['id']}")
+        self.age_wheel.enter(TASK_AGING_INTERVAL, 1, self.age_task, (task,))
     
     def resolve_dependencies(self):
         """Resolve task dependencies"""
-        deps_file = Path("/tmp/ecron_tasks/dependencies.json")
-        
-        if not deps_file.exists():
-            return
-        
         try:
-            with open(deps_file, 'r') as f:
-                dependencies = json.load(f)
+            dependencies = read_json_file(DEPENDENCIES_FILE)
             
             # Process dependency chains
             for chain in dependencies.get("chains", []):
@@ -464,6 +805,8 @@ class SchedulerDaemon:
             prerequisites = dependencies.get("prerequisites", {})
             self.process_task_prerequisites(prerequisites)
             
+        except FileNotFoundError:
+            pass  # no dependencies published
         except Exception as e:
             print(f"❌ Dependency resolution error: {e}")
     
@@ -474,19 +817,18 @@ class SchedulerDaemon:
         if len(chain_order) < 2:
             return
         
-        # Ensure tasks execute in dependency order
-        for i in range(len(chain_order) - 1):
-            current_stage = chain_order[i]
-            next_stage = chain_order[i + 1]
-            
-            # Find tasks in current and next stages
-            current_tasks = [t for t in self.task_queue if current_stage in str(t.get("data", {}))]
-            next_tasks = [t for t in self.task_queue if next_stage in str(t.get("data", {}))]
-            
-            # Set dependencies
-            for next_task in next_tasks:
+        # Ensure tasks execute in dependency order. A task may sit in several
+        # stages; total its demotions so it moves shards once
+        demotions = {}
+        for current_stage, next_stage in zip(chain_order, chain_order[1:]):
+            # Set dependencies on the tasks in the next stage
+            for next_task in self.tasks_matching(next_stage):
                 next_task["depends_on"] = current_stage
-                next_task["priority"] += 1  # Lower priority until dependency met
+                demotion = demotions.setdefault(next_task["id"], [next_task, 0])
+                demotion[1] += 1
+        
+        for next_task, demotion in demotions.values():
+            self.set_task_priority(next_task, next_task["priority"] + demotion)  # Lower priority until dependency met
         
         print(f"🔗 Processed dependency chain: {' → '.join(chain_order)}")
     
@@ -496,15 +838,15 @@ class SchedulerDaemon:
             must_complete_before = prereq_info.get("must_complete_before")
             
             # Find prerequisite and dependent tasks
-            prereq_tasks = [t for t in self.task_queue if task_name in str(t.get("data", {}))]
-            dependent_tasks = [t for t in self.task_queue if must_complete_before in str(t.get("data", {}))]
+            prereq_tasks = self.tasks_matching(task_name)
+            dependent_tasks = self.tasks_matching(must_complete_before)
             
             # Adjust priorities
             for prereq_task in prereq_tasks:
-                prereq_task["priority"] = 1  # Highest priority
+                self.set_task_priority(prereq_task, 1)  # Highest priority
             
             for dependent_task in dependent_tasks:
-                dependent_task["priority"] += 2  # Lower priority
+                self.set_task_priority(dependent_task, dependent_task["priority"] + 2)  # Lower priority
                 dependent_task["depends_on"] = task_name
         
         print(f"📋 Processed {len(prerequisites)} task prerequisites")
@@ -513,15 +855,23 @@ class SchedulerDaemon:
         """Get scheduler daemon status"""
         return {
             "running": self.running,
-            "queue_size": len(self.task_queue),
+            "queue_size": self.queued_count,
             "active_flows": len(self.active_flows),
-            "total_priorities": len(self.priorities)
+            "total_priorities": self.queued_count + len(self.active_flows)
         }
     
     def stop(self):
         """Stop the scheduler daemon"""
         print("🛑 Stopping Scheduler Daemon...")
         self.running = False
+        self._shutdown.set()
+        self._task_arrived.set()
+        
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+        self.inbox.put(None)
+        self.execution_loop.call_soon_threadsafe(self.execution_loop.stop)
         
         if self.ecron_process:
             self.ecron_process.terminate()
@@ -531,8 +881,7 @@ if __name__ == "__main__":
     try:
         daemon.start()
         # Keep daemon running
-        while True:
-            time.sleep(1)
+        daemon._shutdown.wait()
     except KeyboardInterrupt:
         daemon.stop()
         print("👋 Scheduler Daemon stopped.")
\ No newline at end of file
@@ -4,109 +4,494 @@ WolfCog Input Validation and Safety System
 Comprehensive input validation, sanitization, and safety enforcement
 """
 
+import atexit
+import dataclasses
+import functools
 import re
 import json
+import string
 import hashlib
+import queue
+import threading
 import time
+from collections import Counter, defaultdict, deque
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
+def compact_json_line(obj) -> bytes:
+    """JSON Lines entry from the json module, with dataclasses written as objects"""
+    if dataclasses.is_dataclass(obj):
+        obj = dataclasses.asdict(obj)
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode()
+
+# Prefer orjson for the violation log when installed
+try:
+    import orjson
+    
+    def json_line(obj) -> bytes:
+        try:
+            return orjson.dumps(obj) + b"\n"
+        except TypeError:
+            # orjson refuses lone surrogates, which the json module escapes
+            return compact_json_line(obj)
+except ImportError:
+    json_line = compact_json_line
+
+# NumPy vectorizes the bracket depth scan on long expressions
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Numba compiles the symbolic expression scan to machine code
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+VIOLATIONS_DIR = Path("/tmp/wolfcog_security_violations")
+
+# Violations waiting to be written; beyond this they are dropped and counted
+VIOLATION_QUEUE_SIZE = 10000
+
+# Most violations appended to the log file per write
+VIOLATION_BATCH_SIZE = 64
+
+# Validation rules for each input type, shared by all validators
+VALIDATION_RULES = {
+    "task_spec": {
+        "required_fields": ["flow", "space", "action"],
+        "valid_spaces": ["u", "e", "s"],
+        "valid_actions": ["evaluate", "evolve", "optimize", "test", "meta_evolve"],
+        "max_flow_length": 100,
+        "max_symbolic_length": 1000,
+        "allowed_symbolic_chars": r"[∇∂⊗ΦΩ∑αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ]",
+        "forbidden_patterns": [
+            r"<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>",  # Script injection
+            r"javascript:",  # JavaScript URLs
+            r"eval\s*\(",  # Eval calls
+            r"exec\s*\(",  # Exec calls
+            r"__import__",  # Import injection
+            r"system\s*\(",  # System calls
+            r"subprocess",  # Subprocess calls
+            r"os\.system",  # OS system calls
+            r"rm\s+-rf",  # Dangerous file operations
+            r"\.\.\/",  # Path traversal
+        ]
+    },
+    "agent_command": {
+        "max_length": 500,
+        "allowed_commands": [
+            "status", "restart", "stop", "start", "optimize", 
+            "coordinate", "analyze", "report", "monitor"
+        ],
+        "forbidden_commands": [
+            "delete", "destroy", "corrupt", "hack", "exploit",
+            "shell", "bash", "cmd", "powershell"
+        ],
+        "injection_patterns": [
+            r";\s*\w+",  # Command chaining
+            r"\|\s*\w+",  # Pipe to command
+            r"&&\s*\w+",  # AND command
+            r"\|\|\s*\w+",  # OR command
+            r"`[^`]+`",  # Backtick execution
+            r"\$\([^)]+\)"  # Command substitution
+        ]
+    },
+    "memory_path": {
+        "max_depth": 10,
+        "allowed_extensions": [".txt", ".json", ".scm", ".lisp", ".wl", ".py", ".md"],
+        "forbidden_paths": [
+            "/etc/passwd", "/etc/shadow", "/boot", "/sys", "/proc",
+            "/.ssh", "/root", "/home/*/.ssh"
+        ],
+        "max_path_length": 255
+    },
+    "symbolic_expression": {
+        "max_length": 2000,
+        "max_nesting_depth": 20,
+        "allowed_functions": [
+            "∇", "∂", "⊗", "Φ", "Ω", "∑", "sin", "cos", "exp", "log",
+            "D", "Integrate", "Simplify", "Expand", "Factor"
+        ],
+        "forbidden_functions": [
+            "Delete", "DeleteFile", "DeleteDirectory", "Run", "RunProcess",
+            "Import", "Export", "Get", "Put", "OpenWrite", "SystemOpen"
+        ]
+    }
+}
+
+# Safety limits for system operations
+SAFETY_LIMITS = {
+    "max_task_rate": 10,  # tasks per second
+    "max_memory_usage": 1024 * 1024 * 1024,  # 1GB
+    "max_file_size": 10 * 1024 * 1024,  # 10MB
+    "max_recursion_depth": 15,
+    "max_concurrent_operations": 50,
+    "max_symbolic_complexity": 1000,
+    "rate_limit_window": 60,  # seconds
+    "max_violations_per_hour": 10
+}
+
+# Validation results remembered per validator
+VALIDATION_CACHE_SIZE = 4096
+
+# Longer inputs are validated afresh rather than filling the cache
+VALIDATION_CACHE_MAX_LENGTH = 2000
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Violation:
+    """A logged security violation"""
+    timestamp: float
+    type: str
+    details: str
+    context_hash: str
+    severity: str
+
+class ViolationWriter:
+    """Appends security violations to an hourly JSON Lines file from a background thread"""
+    
+    def __init__(self, directory: Path = VIOLATIONS_DIR):
+        self.directory = directory
+        self.queue = queue.Queue(maxsize=VIOLATION_QUEUE_SIZE)
+        self.dropped = 0
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def submit(self, violation: Violation) -> bool:
+        """Queue a violation for writing; False if the queue was full and it was dropped"""
+        self.start()
+        try:
+            self.queue.put_nowait(violation)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+    
+    def start(self):
+        """Start the writer thread on first use"""
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.directory.mkdir(exist_ok=True)
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+                atexit.register(self.close)  # writes out what is still queued
+    
+    def run(self):
+        """Write queued violations in batches until closed"""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < VIOLATION_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            violations = [v for v in batch if v is not None]
+            if violations:
+                self.write_batch(violations)
+            if len(violations) < len(batch):
+                return
+    
+    def write_batch(self, violations: List[Violation]):
+        """Append violations to the current hour's log file"""
+        log_file = self.directory / f"violations-{int(time.time() // 3600)}.jsonl"
+        try:
+            with open(log_file, 'ab') as f:
+                f.write(b"".join(map(json_line, violations)))
+        except OSError as e:
+            print(f"⚠️ Could not write security violations: {e}")
+    
+    def close(self):
+        """Flush queued violations and stop the writer thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=5)
+
+# Below this length the Python depth loop is faster than converting to an array
+VECTORIZED_DEPTH_MIN_LENGTH = 100
+
+# Maps the UTF-8 bytes of an expression to its depth changes, as int8; bracket
+# bytes never occur inside multibyte sequences
+DEPTH_DELTAS = bytes(1 if byte in b"([{" else 255 if byte in b")]}" else 0 for byte in range(256))
+
+# A function call as scan_symbolic_expression counts them: an opening parenthesis
+# whose previous non-whitespace character is a word character (\w is isalnum or _)
+CALL_RE = re.compile(r"\w\s*\(")
+
+# Below this length the Python scan beats the NumPy depth plus C-level counts
+VECTORIZED_SCAN_MIN_LENGTH = 250
+
+# Below this length the Python scan is faster than converting to an array
+COMPILED_SCAN_MIN_LENGTH = 32
+
+# Character classes of the compiled scan, with SYMBOL_CHAR or-ed on for special symbols
+OTHER_CHAR, CALL_OPEN_CHAR, OPEN_CHAR, CLOSE_CHAR, WORD_CHAR, SPACE_CHAR = range(6)
+SYMBOL_CHAR = 8
+
+if NUMBA_AVAILABLE:
+    @functools.lru_cache(maxsize=None)
+    def char_class_table(symbolic_chars: frozenset) -> "np.ndarray":
+        """Class of every BMP code point, as scan_symbolic_expression tells them apart"""
+        table = np.zeros(0x10000, dtype=np.uint8)
+        for code_point in range(0x10000):
+            char = chr(code_point)
+            if char == "(":
+                char_class = CALL_OPEN_CHAR
+            elif char in "[{":
+                char_class = OPEN_CHAR
+            elif char in ")]}":
+                char_class = CLOSE_CHAR
+            elif char.isalnum() or char == "_":
+                char_class = WORD_CHAR
+            elif char.isspace():
+                char_class = SPACE_CHAR
+            else:
+                char_class = OTHER_CHAR
+            if char in symbolic_chars:
+                char_class |= SYMBOL_CHAR
+            table[code_point] = char_class
+        return table
+    
+    @njit
+    def scan_code_points(code_points, char_classes):
+        """Compiled scan_symbolic_expression; depth is -1 if a code point is outside the table"""
+        max_depth = current_depth = 0
+        symbol_count = call_count = 0
+        after_word = False
+        
+        for code_point in code_points:
+            if code_point >= char_classes.shape[0]:
+                return -1, 0, 0
+            char_class = char_classes[code_point]
+            if char_class & SYMBOL_CHAR:
+                symbol_count += 1
+                char_class ^= SYMBOL_CHAR
+            
+            if char_class == CALL_OPEN_CHAR or char_class == OPEN_CHAR:
+                if after_word and char_class == CALL_OPEN_CHAR:
+                    call_count += 1
+                current_depth += 1
+                if current_depth > max_depth:
+                    max_depth = current_depth
+                after_word = False
+            elif char_class == CLOSE_CHAR:
+                if current_depth:
+                    current_depth -= 1
+                after_word = False
+            elif char_class == WORD_CHAR:
+                after_word = True
+            elif char_class != SPACE_CHAR:
+                after_word = False
+        
+        return max_depth, symbol_count, call_count
+
+# Shared by every validator, so a process has one writer thread and log file
+violation_writer = ViolationWriter()
+
 class WolfCogInputValidator:
     """Comprehensive input validation and safety system for WolfCog"""
     
+    # str.translate table deleting null bytes and control characters,
+    # except common whitespace
+    CONTROL_CHARS = dict.fromkeys(c for c in range(32) if chr(c) not in '\t\n\r')
+    
+    # Symbols that each add to an expression's complexity
+    SYMBOLIC_CHARS = frozenset("∇∂⊗ΦΩ∑")
+    
+    # Window, in seconds, of violations counted towards the security level
+    VIOLATION_WINDOW = 3600
+    
+    # Sanitized string length limits by input type
+    MAX_INPUT_LENGTHS = {
+        "task_spec": 1000,
+        "agent_command": 500,
+        "memory_path": 255,
+        "symbolic_expression": 2000,
+        "general": 1000
+    }
+    
     def __init__(self):
         self.validation_rules = self.load_validation_rules()
         self.safety_limits = self.load_safety_limits()
-        self.violation_log = []
+        self.compiled_patterns = self.compile_patterns()
+        # Violations within VIOLATION_WINDOW, oldest first, with running
+        # per-severity counts; older ones only add to the totals
+        self.violation_log = deque()
+        self.severity_counts = Counter()
+        self.total_violations = 0
+        self.last_violation = None
+        # Operation timestamps within the rate limit window, oldest first, by
+        # (operation type, identifier); idle keys are swept once per window
+        self.rate_limit_log = defaultdict(deque)
+        self.next_rate_limit_sweep = 0.0
+        # Errors and violations by input, so repeated inputs skip the scans
+        self.validation_cache = functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)(self.check_cached_input)
         
     def load_validation_rules(self) -> Dict[str, Any]:
         """Load validation rules for different input types"""
+        return VALIDATION_RULES
+    
+    def compile_patterns(self) -> Dict[str, Any]:
+        """Compile the validation regexes once, keeping each source pattern for logging
+        
+        Each pattern list also gets a single alternation of all its patterns, so
+        clean input is rejected in one pass before any per-pattern search
+        """
+        rules = self.validation_rules
+        forbidden_patterns = rules["task_spec"]["forbidden_patterns"]
+        injection_patterns = rules["agent_command"]["injection_patterns"]
+        forbidden_commands = rules["agent_command"]["forbidden_commands"]
+        forbidden_functions = rules["symbolic_expression"]["forbidden_functions"]
         return {
-            "task_spec": {
-                "required_fields": ["flow", "space", "action"],
-                "valid_spaces": ["u", "e", "s"],
-                "valid_actions": ["evaluate", "evolve", "optimize", "test", "meta_evolve"],
-                "max_flow_length": 100,
-                "max_symbolic_length": 1000,
-                "allowed_symbolic_chars": r"[∇∂⊗ΦΩ∑αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ]",
-                "forbidden_patterns": [
-                    r"<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>",  # Script injection
-                    r"javascript:",  # JavaScript URLs
-                    r"eval\s*\(",  # Eval calls
-                    r"exec\s*\(",  # Exec calls
-                    r"__import__",  # Import injection
-                    r"system\s*\(",  # System calls
-                    r"subprocess",  # Subprocess calls
-                    r"os\.system",  # OS system calls
-                    r"rm\s+-rf",  # Dangerous file operations
-                    r"\.\.\/",  # Path traversal
-                ]
-            },
-            "agent_command": {
-                "max_length": 500,
-                "allowed_commands": [
-                    "status", "restart", "stop", "start", "optimize", 
-                    "coordinate", "analyze", "report", "monitor"
-                ],
-                "forbidden_commands": [
-                    "delete", "destroy", "corrupt", "hack", "exploit",
-                    "shell", "bash", "cmd", "powershell"
-                ]
-            },
-            "memory_path": {
-                "max_depth": 10,
-                "allowed_extensions": [".txt", ".json", ".scm", ".lisp", ".wl", ".py", ".md"],
-                "forbidden_paths": [
-                    "/etc/passwd", "/etc/shadow", "/boot", "/sys", "/proc",
-                    "/.ssh", "/root", "/home/*/.ssh"
-                ],
-                "max_path_length": 255
-            },
-            "symbolic_expression": {
-                "max_length": 2000,
-                "max_nesting_depth": 20,
-                "allowed_functions": [
-                    "∇", "∂", "⊗", "Φ", "Ω", "∑", "sin", "cos", "exp", "log",
-                    "D", "Integrate", "Simplify", "Expand", "Factor"
-                ],
-                "forbidden_functions": [
-                    "Delete", "DeleteFile", "DeleteDirectory", "Run", "RunProcess",
-                    "Import", "Export", "Get", "Put", "OpenWrite", "SystemOpen"
-                ]
-            }
+            "forbidden_patterns": [(pattern, re.compile(pattern, re.IGNORECASE))
+                                   for pattern in forbidden_patterns],
+            "forbidden_union": re.compile("|".join(f"(?:{p})" for p in forbidden_patterns), re.IGNORECASE),
+            "injection_patterns": [(pattern, re.compile(pattern))
+                                   for pattern in injection_patterns],
+            "injection_union": re.compile("|".join(f"(?:{p})" for p in injection_patterns)),
+            "forbidden_commands_union": re.compile("|".join(map(re.escape, forbidden_commands)), re.IGNORECASE),
+            "forbidden_commands_lower": [(forbidden, forbidden.lower()) for forbidden in forbidden_commands],
+            "forbidden_functions_union": re.compile("|".join(map(re.escape, forbidden_functions))),
+            "forbidden_path_trie": self.build_prefix_trie(rules["memory_path"]["forbidden_paths"]),
+            # Sets for membership tests; the rule lists stay as they are for messages
+            "valid_spaces": frozenset(rules["task_spec"]["valid_spaces"]),
+            "valid_actions": frozenset(rules["task_spec"]["valid_actions"]),
+            "allowed_extensions": frozenset(rules["memory_path"]["allowed_extensions"]),
+            # Alphanumeric, common punctuation, and symbolic mathematical characters
+            "safe_string": re.compile(r"^[a-zA-Z0-9\s\-_.,!?()[\]{}∇∂⊗ΦΩ∑αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ]+$"),
+            # The same characters as a set, with ASCII whitespace standing in for \s
+            "safe_chars": frozenset(string.ascii_letters + string.digits + string.whitespace +
+                                    "-_.,!?()[]{}∇∂⊗ΦΩ∑αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ")
         }
     
+    def build_prefix_trie(self, prefixes: List[str]) -> Dict[str, Any]:
+        """Build a character trie of path prefixes, with wildcards removed
+        
+        A node that ends a prefix holds, under the key None (which no character can
+        collide with), the (index, original) pairs ending there
+        """
+        trie = {}
+        for index, prefix in enumerate(prefixes):
+            node = trie
+            for char in prefix.replace("*", ""):
+                node = node.setdefault(char, {})
+            node.setdefault(None, []).append((index, prefix))
+        return trie
+    
+    def match_prefixes(self, trie: Dict[str, Any], s: str) -> List[str]:
+        """Original form of every trie prefix that s starts with, in list order"""
+        matches = list(trie.get(None, ()))
+        node = trie
+        for char in s:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                matches.extend(node[None])
+        return [prefix for _, prefix in sorted(matches)]
+    
     def load_safety_limits(self) -> Dict[str, Any]:
         """Load safety limits for system operations"""
-        return {
-            "max_task_rate": 10,  # tasks per second
-            "max_memory_usage": 1024 * 1024 * 1024,  # 1GB
-            "max_file_size": 10 * 1024 * 1024,  # 10MB
-            "max_recursion_depth": 15,
-            "max_concurrent_operations": 50,
-            "max_symbolic_complexity": 1000,
-            "rate_limit_window": 60,  # seconds
-            "max_violations_per_hour": 10
-        }
+        return SAFETY_LIMITS
     
     def validate_task_specification(self, task_spec: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """Validate task specification input"""
+        return self.run_validation("task_spec", task_spec)
+    
+    def validate_agent_command(self, command: str, agent_type: str = "") -> Tuple[bool, List[str]]:
+        """Validate agent command input"""
+        return self.run_validation("agent_command", command)
+    
+    def validate_memory_path(self, path: str) -> Tuple[bool, List[str]]:
+        """Validate memory/file path input"""
+        return self.run_validation("memory_path", path)
+    
+    def validate_symbolic_expression(self, expression: str) -> Tuple[bool, List[str]]:
+        """Validate symbolic mathematical expression"""
+        return self.run_validation("symbolic_expression", expression)
+    
+    def run_validation(self, input_type: str, input_data: Any) -> Tuple[bool, List[str]]:
+        """Run the check for an input type, reusing the result for a repeated input
+        
+        Violations are logged on every call, whether or not the result was cached
+        """
+        return self.run_keyed_validation(input_type, input_data, self.validation_key(input_data))
+    
+    def run_keyed_validation(self, input_type: str, input_data: Any, key: Optional[Any]) -> Tuple[bool, List[str]]:
+        """run_validation with the cache key already built; None skips the cache"""
+        if key is None:
+            errors, violations = self.check_input(input_type, input_data)
+        else:
+            errors, violations = self.validation_cache(input_type, key)
+        
+        for violation in violations:
+            self.log_security_violation(*violation)
+        
+        return len(errors) == 0, list(errors)
+    
+    def validation_key(self, input_data: Any) -> Optional[Any]:
+        """Hashable cache key for an input, or None if it should not be cached"""
+        if isinstance(input_data, str):
+            return input_data if len(input_data) <= VALIDATION_CACHE_MAX_LENGTH else None
+        
+        # Task specs are cached only when made of plain scalars; the value type
+        # is kept in the key since 1, 1.0 and True compare equal
+        if isinstance(input_data, dict):
+            total_length = 0
+            for field, value in input_data.items():
+                if not isinstance(field, str) or not isinstance(value, (str, int, float, bool, type(None))):
+                    return None
+                total_length += len(field) + (len(value) if isinstance(value, str) else 0)
+            if total_length > VALIDATION_CACHE_MAX_LENGTH:
+                return None
+            return tuple(sorted((field, type(value), value) for field, value in input_data.items()))
+        
+        return None
+    
+    def check_cached_input(self, input_type: str, key: Any) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str, str], ...]]:
+        """Check the input a cache key was built from"""
+        if input_type == "task_spec":
+            return self.check_input(input_type, {field: value for field, _, value in key})
+        return self.check_input(input_type, key)
+    
+    def check_input(self, input_type: str, input_data: Any) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str, str], ...]]:
+        """Check an input, returning its errors and the (type, details, context) of each violation"""
+        checks = {
+            "task_spec": self.check_task_specification,
+            "agent_command": self.check_agent_command,
+            "memory_path": self.check_memory_path,
+            "symbolic_expression": self.check_symbolic_expression
+        }
+        errors, violations = checks[input_type](input_data)
+        return tuple(errors), tuple(violations)
+    
+    def check_task_specification(self, task_spec: Dict[str, Any]) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """Check task specification input"""
         errors = []
+        violations = []
         rules = self.validation_rules["task_spec"]
+        patterns = self.compiled_patterns
         
         # Check required fields
         for field in rules["required_fields"]:
             if field not in task_spec:
                 errors.append(f"Missing required field: {field}")
         
-        # Validate space
+        # Validate space (only a string can be valid, and other values may be unhashable)
         if "space" in task_spec:
-            if task_spec["space"] not in rules["valid_spaces"]:
+            space = task_spec["space"]
+            if not (isinstance(space, str) and space in patterns["valid_spaces"]):
                 errors.append(f"Invalid space: {task_spec['space']}. Must be one of {rules['valid_spaces']}")
         
         # Validate action
         if "action" in task_spec:
-            if task_spec["action"] not in rules["valid_actions"]:
+            action = task_spec["action"]
+            if not (isinstance(action, str) and action in patterns["valid_actions"]):
                 errors.append(f"Invalid action: {task_spec['action']}. Must be one of {rules['valid_actions']}")
         
         # Validate flow name
@@ -126,111 +511,139 @@ class WolfCogInputValidator:
                 if len(symbolic) > rules["max_symbolic_length"]:
                     errors.append(f"Symbolic expression too long: {len(symbolic)} > {rules['max_symbolic_length']}")
                 
-                # Check for forbidden patterns
-                for pattern in rules["forbidden_patterns"]:
-                    if re.search(pattern, symbolic, re.IGNORECASE):
-                        errors.append(f"Forbidden pattern detected in symbolic expression")
-                        self.log_security_violation("forbidden_pattern", pattern, symbolic)
-        
-        return len(errors) == 0, errors
+                # Check for forbidden patterns, naming each one only if any matched.
+                # Only the allowed length is scanned: anything longer is already an
+                # error, and the backtracking patterns are quadratic in the length
+                scanned = symbolic[:rules["max_symbolic_length"]]
+                if patterns["forbidden_union"].search(scanned):
+                    for pattern, compiled in patterns["forbidden_patterns"]:
+                        if compiled.search(scanned):
+                            errors.append(f"Forbidden pattern detected in symbolic expression")
+                            violations.append(("forbidden_pattern", pattern, symbolic))
+        
+        return errors, violations
     
-    def validate_agent_command(self, command: str, agent_type: str = "") -> Tuple[bool, List[str]]:
-        """Validate agent command input"""
+    def check_agent_command(self, command: str) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """Check agent command input"""
         errors = []
+        violations = []
         rules = self.validation_rules["agent_command"]
+        patterns = self.compiled_patterns
         
         if len(command) > rules["max_length"]:
             errors.append(f"Command too long: {len(command)} > {rules['max_length']}")
         
-        # Check for forbidden commands
-        for forbidden in rules["forbidden_commands"]:
-            if forbidden.lower() in command.lower():
-                errors.append(f"Forbidden command detected: {forbidden}")
-                self.log_security_violation("forbidden_command", forbidden, command)
-        
-        # Check command injection patterns
-        injection_patterns = [
-            r";\s*\w+",  # Command chaining
-            r"\|\s*\w+",  # Pipe to command
-            r"&&\s*\w+",  # AND command
-            r"\|\|\s*\w+",  # OR command
-            r"`[^`]+`",  # Backtick execution
-            r"\$\([^)]+\)"  # Command substitution
-        ]
-        
-        for pattern in injection_patterns:
-            if re.search(pattern, command):
-                errors.append("Potential command injection detected")
-                self.log_security_violation("command_injection", pattern, command)
-        
-        return len(errors) == 0, errors
+        # As for symbolic expressions, only the allowed length is scanned
+        scanned = command[:rules["max_length"]]
+        
+        # Check for forbidden commands, naming each one only if any matched
+        if patterns["forbidden_commands_union"].search(scanned):
+            command_lower = scanned.lower()
+            for forbidden, forbidden_lower in patterns["forbidden_commands_lower"]:
+                if forbidden_lower in command_lower:
+                    errors.append(f"Forbidden command detected: {forbidden}")
+                    violations.append(("forbidden_command", forbidden, command))
+        
+        # Check command injection patterns, naming each one only if any matched
+        if patterns["injection_union"].search(scanned):
+            for pattern, compiled in patterns["injection_patterns"]:
+                if compiled.search(scanned):
+                    errors.append("Potential command injection detected")
+                    violations.append(("command_injection", pattern, command))
+        
+        return errors, violations
     
-    def validate_memory_path(self, path: str) -> Tuple[bool, List[str]]:
-        """Validate memory/file path input"""
+    def check_memory_path(self, path: str) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """Check memory/file path input"""
         errors = []
+        violations = []
         rules = self.validation_rules["memory_path"]
+        patterns = self.compiled_patterns
         
         if len(path) > rules["max_path_length"]:
             errors.append(f"Path too long: {len(path)} > {rules['max_path_length']}")
         
-        # Check for forbidden paths
-        for forbidden in rules["forbidden_paths"]:
-            if path.startswith(forbidden.replace("*", "")):
-                errors.append(f"Access to forbidden path: {forbidden}")
-                self.log_security_violation("forbidden_path", forbidden, path)
+        # Check for forbidden paths in one walk of the prefix trie
+        for forbidden in self.match_prefixes(patterns["forbidden_path_trie"], path):
+            errors.append(f"Access to forbidden path: {forbidden}")
+            violations.append(("forbidden_path", forbidden, path))
         
         # Check for path traversal
         if ".." in path:
             errors.append("Path traversal detected")
-            self.log_security_violation("path_traversal", "..", path)
+            violations.append(("path_traversal", "..", path))
         
-        # Check path depth
-        path_depth = len(Path(path).parts)
-        if path_depth > rules["max_depth"]:
-            errors.append(f"Path depth exceeds limit: {path_depth} > {rules['max_depth']}")
+        # Check path depth; a path with few slashes cannot be too deep
+        if path.count("/") >= rules["max_depth"]:
+            path_depth = len(self.path_components(path)) + path.startswith("/")
+            if path_depth > rules["max_depth"]:
+                errors.append(f"Path depth exceeds limit: {path_depth} > {rules['max_depth']}")
         
         # Check file extension if it's a file
         if "." in path:
-            extension = Path(path).suffix
-            if extension and extension not in rules["allowed_extensions"]:
+            extension = self.path_extension(path)
+            if extension and extension not in patterns["allowed_extensions"]:
                 errors.append(f"Invalid file extension: {extension}")
         
-        return len(errors) == 0, errors
+        return errors, violations
     
-    def validate_symbolic_expression(self, expression: str) -> Tuple[bool, List[str]]:
-        """Validate symbolic mathematical expression"""
+    def path_components(self, path: str) -> List[str]:
+        """Path components as pathlib parses them, skipping empty and "." components"""
+        return [part for part in path.split("/") if part and part != "."]
+    
+    def path_extension(self, path: str) -> str:
+        """Extension of the final path component, as pathlib's suffix"""
+        components = self.path_components(path)
+        name = components[-1] if components else ""
+        dot = name.rfind(".")
+        return name[dot:] if 0 < dot < len(name) - 1 else ""
+    
+    def check_symbolic_expression(self, expression: str) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """Check symbolic mathematical expression"""
         errors = []
+        violations = []
         rules = self.validation_rules["symbolic_expression"]
         
         if len(expression) > rules["max_length"]:
             errors.append(f"Expression too long: {len(expression)} > {rules['max_length']}")
         
         # Check nesting depth
-        nesting_depth = self.calculate_nesting_depth(expression)
+        scan = self.scan_symbolic_expression(expression)
+        nesting_depth = scan[0]
         if nesting_depth > rules["max_nesting_depth"]:
             errors.append(f"Expression nesting too deep: {nesting_depth} > {rules['max_nesting_depth']}")
         
-        # Check for forbidden functions
-        for forbidden in rules["forbidden_functions"]:
-            if forbidden in expression:
-                errors.append(f"Forbidden function detected: {forbidden}")
-                self.log_security_violation("forbidden_function", forbidden, expression)
+        # Check for forbidden functions, naming each one only if any matched
+        if self.compiled_patterns["forbidden_functions_union"].search(expression):
+            for forbidden in rules["forbidden_functions"]:
+                if forbidden in expression:
+                    errors.append(f"Forbidden function detected: {forbidden}")
+                    violations.append(("forbidden_function", forbidden, expression))
         
         # Check complexity
-        complexity = self.calculate_symbolic_complexity(expression)
+        complexity = self.calculate_symbolic_complexity(expression, scan)
         if complexity > self.safety_limits["max_symbolic_complexity"]:
             errors.append(f"Expression complexity too high: {complexity} > {self.safety_limits['max_symbolic_complexity']}")
         
-        return len(errors) == 0, errors
+        return errors, violations
     
     def is_safe_string(self, s: str) -> bool:
         """Check if string contains only safe characters"""
-        # Allow alphanumeric, common punctuation, and symbolic mathematical characters
-        safe_pattern = r"^[a-zA-Z0-9\s\-_.,!?()[\]{}∇∂⊗ΦΩ∑αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ]+$"
-        return re.match(safe_pattern, s) is not None
+        # Set lookups settle the common case; the regex also knows Unicode whitespace
+        if s and self.compiled_patterns["safe_chars"].issuperset(s):
+            return True
+        return self.compiled_patterns["safe_string"].match(s) is not None
     
     def calculate_nesting_depth(self, expression: str) -> int:
         """Calculate the maximum nesting depth of brackets/parentheses"""
+        if NUMPY_AVAILABLE and len(expression) >= VECTORIZED_DEPTH_MIN_LENGTH:
+            # Unmatched closers are ignored at depth 0, so the depth is the
+            # running sum less the lowest point (at most 0) it has reached
+            deltas = np.frombuffer(expression.encode("utf-8", "surrogatepass").translate(DEPTH_DELTAS), dtype=np.int8)
+            running = np.cumsum(deltas)
+            floor = np.minimum.accumulate(np.minimum(running, 0))
+            return int((running - floor).max(initial=0))
+        
         max_depth = 0
         current_depth = 0
         
@@ -243,25 +656,67 @@ class WolfCogInputValidator:
         
         return max_depth
     
-    def calculate_symbolic_complexity(self, expression: str) -> int:
-        """Calculate complexity score of symbolic expression"""
-        complexity = 0
-        
-        # Base complexity from length
-        complexity += len(expression)
+    def scan_symbolic_expression(self, expression: str) -> Tuple[int, int, int]:
+        """Nesting depth, special symbol count and function call count, in one pass
+        
+        A function call is an opening parenthesis after a word, with only
+        whitespace between them.
+        """
+        symbolic_chars = self.SYMBOLIC_CHARS
+        
+        # Without an opening bracket there is no nesting and no call to find,
+        # so only the special symbols need counting
+        if "(" not in expression and "[" not in expression and "{" not in expression:
+            return 0, sum(map(expression.count, symbolic_chars)), 0
+        
+        # Long expressions go through the compiled scan when Numba is installed
+        if NUMBA_AVAILABLE and len(expression) >= COMPILED_SCAN_MIN_LENGTH:
+            code_points = np.frombuffer(expression.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+            scan = scan_code_points(code_points, char_class_table(symbolic_chars))
+            if scan[0] >= 0:
+                return scan
+        
+        # Otherwise NumPy finds the depth, and C-level counts do the rest
+        if NUMPY_AVAILABLE and len(expression) >= VECTORIZED_SCAN_MIN_LENGTH:
+            return (self.calculate_nesting_depth(expression),
+                    sum(map(expression.count, symbolic_chars)),
+                    len(CALL_RE.findall(expression)))
+        
+        max_depth = current_depth = 0
+        symbol_count = call_count = 0
+        after_word = False
         
-        # Add complexity for special symbols
-        symbolic_chars = "∇∂⊗ΦΩ∑"
-        complexity += sum(expression.count(char) * 10 for char in symbolic_chars)
-        
-        # Add complexity for nesting
-        complexity += self.calculate_nesting_depth(expression) * 5
+        for char in expression:
+            if char in symbolic_chars:
+                symbol_count += 1
+            
+            if char in "([{":
+                if after_word and char == "(":
+                    call_count += 1
+                current_depth += 1
+                if current_depth > max_depth:
+                    max_depth = current_depth
+                after_word = False
+            elif char in ")]}":
+                if current_depth:
+                    current_depth -= 1
+                after_word = False
+            elif char.isalnum() or char == "_":
+                after_word = True
+            elif not char.isspace():
+                after_word = False
+        
+        return max_depth, symbol_count, call_count
+    
+    def calculate_symbolic_complexity(self, expression: str, scan: Optional[Tuple[int, int, int]] = None) -> int:
+        """Calculate complexity score of symbolic expression
         
-        # Add complexity for function calls
-        function_pattern = r"\w+\s*\("
-        complexity += len(re.findall(function_pattern, expression)) * 3
+        scan is the result of scan_symbolic_expression, when already computed.
+        """
+        max_depth, symbol_count, call_count = scan or self.scan_symbolic_expression(expression)
         
-        return complexity
+        # Length, plus special symbols, nesting and function calls
+        return len(expression) + symbol_count * 10 + max_depth * 5 + call_count * 3
     
     def sanitize_input(self, input_data: Any, input_type: str = "general") -> Any:
         """Sanitize input data based on type"""
@@ -276,22 +731,11 @@ class WolfCogInputValidator:
     
     def sanitize_string(self, s: str, input_type: str = "general") -> str:
         """Sanitize string input"""
-        # Remove null bytes
-        s = s.replace('\x00', '')
-        
-        # Remove control characters except common whitespace
-        s = ''.join(char for char in s if ord(char) >= 32 or char in '\t\n\r')
+        # Remove null bytes and control characters except common whitespace
+        s = s.translate(self.CONTROL_CHARS)
         
         # Limit length based on type
-        max_lengths = {
-            "task_spec": 1000,
-            "agent_command": 500,
-            "memory_path": 255,
-            "symbolic_expression": 2000,
-            "general": 1000
-        }
-        
-        max_length = max_lengths.get(input_type, 1000)
+        max_length = self.MAX_INPUT_LENGTHS.get(input_type, 1000)
         if len(s) > max_length:
             s = s[:max_length]
         
@@ -312,13 +756,47 @@ class WolfCogInputValidator:
         
         return sanitized
     
+    def sanitize_and_validate_task_spec(self, task_spec: Dict[str, Any]) -> Tuple[bool, List[str], Dict[str, Any]]:
+        """Sanitize a task specification and validate the result
+        
+        The cache key is built while sanitizing, so the spec is walked once
+        rather than again for validation.
+        """
+        sanitized = {}
+        cacheable = True
+        total_length = 0
+        
+        for key, value in task_spec.items():
+            clean_key = self.sanitize_string(str(key), "task_spec")
+            total_length += len(clean_key)
+            
+            if isinstance(value, str):
+                clean_value = self.sanitize_string(value, "task_spec")
+                total_length += len(clean_value)
+            elif isinstance(value, (int, float, bool, type(None))):
+                clean_value = value
+            else:
+                clean_value = self.sanitize_input(value, "task_spec")
+                cacheable = False
+            
+            sanitized[clean_key] = clean_value
+        
+        cache_key = None
+        if cacheable and total_length <= VALIDATION_CACHE_MAX_LENGTH:
+            cache_key = tuple(sorted((field, type(value), value) for field, value in sanitized.items()))
+        
+        is_valid, errors = self.run_keyed_validation("task_spec", sanitized, cache_key)
+        return is_valid, errors, sanitized
+    
     def check_rate_limit(self, operation_type: str, identifier: str = "default") -> bool:
         """Check if operation is within rate limits"""
         current_time = time.time()
         window_start = current_time - self.safety_limits["rate_limit_window"]
         
-        # Clean old entries
-        self.clean_rate_limit_log(window_start)
+        # Drop keys that have gone idle, once per window
+        if current_time >= self.next_rate_limit_sweep:
+            self.clean_rate_limit_log(window_start)
+            self.next_rate_limit_sweep = current_time + self.safety_limits["rate_limit_window"]
         
         # Count recent operations
         recent_ops = self.count_recent_operations(operation_type, identifier, window_start)
@@ -333,26 +811,31 @@ class WolfCogInputValidator:
     
     def log_security_violation(self, violation_type: str, details: str, context: str):
         """Log security violation"""
-        violation = {
-            "timestamp": time.time(),
-            "type": violation_type,
-            "details": details,
-            "context_hash": hashlib.md5(context.encode()).hexdigest(),
-            "severity": self.get_violation_severity(violation_type)
-        }
+        violation = Violation(
+            timestamp=time.time(),
+            type=violation_type,
+            details=details,
+            context_hash=self.context_hash(context),
+            severity=self.get_violation_severity(violation_type)
+        )
         
         self.violation_log.append(violation)
+        self.severity_counts[violation.severity] += 1
+        self.total_violations += 1
+        self.last_violation = violation.timestamp
+        self.expire_violations(violation.timestamp)
         
-        # Log to file
-        violations_dir = Path("/tmp/wolfcog_security_violations")
-        violations_dir.mkdir(exist_ok=True)
-        
-        violation_file = violations_dir / f"violation_{int(time.time())}.json"
-        with open(violation_file, 'w') as f:
-            json.dump(violation, f, indent=2)
+        # Log to file, off the validation path
+        violation_writer.submit(violation)
         
         print(f"🚨 Security violation logged: {violation_type} - {details}")
     
+    def context_hash(self, context: Any) -> str:
+        """Short non-cryptographic fingerprint of a violation's context"""
+        if not isinstance(context, bytes):
+            context = str(context).encode('utf-8', errors='replace')
+        return hashlib.blake2b(context, digest_size=8).hexdigest()
+    
     def get_violation_severity(self, violation_type: str) -> str:
         """Get severity level for violation type"""
         severity_map = {
@@ -366,69 +849,71 @@ class WolfCogInputValidator:
         }
         return severity_map.get(violation_type, "low")
     
+    def expire_violations(self, current_time: float):
+        """Drop violations that have left the window from the log and counts"""
+        window_start = current_time - self.VIOLATION_WINDOW
+        while self.violation_log and self.violation_log[0].timestamp <= window_start:
+            expired = self.violation_log.popleft()
+            self.severity_counts[expired.severity] -= 1
+    
     def get_security_status(self) -> Dict[str, Any]:
         """Get current security status"""
-        current_time = time.time()
-        hour_ago = current_time - 3600
-        
-        recent_violations = [v for v in self.violation_log if v["timestamp"] > hour_ago]
+        self.expire_violations(time.time())
+        counts = self.severity_counts
         
         return {
-            "total_violations": len(self.violation_log),
-            "recent_violations": len(recent_violations),
-            "critical_violations": len([v for v in recent_violations if v["severity"] == "critical"]),
-            "high_violations": len([v for v in recent_violations if v["severity"] == "high"]),
-            "security_level": self.calculate_security_level(recent_violations),
-            "last_violation": max([v["timestamp"] for v in self.violation_log]) if self.violation_log else None
+            "total_violations": self.total_violations,
+            "recent_violations": len(self.violation_log),
+            "critical_violations": counts["critical"],
+            "high_violations": counts["high"],
+            "security_level": self.security_level_for(len(self.violation_log), counts["critical"], counts["high"]),
+            "last_violation": self.last_violation,
+            "dropped_violations": violation_writer.dropped
         }
     
-    def calculate_security_level(self, recent_violations: List[Dict]) -> str:
+    def calculate_security_level(self, recent_violations: List[Violation]) -> str:
         """Calculate current security threat level"""
-        if not recent_violations:
+        critical_count = len([v for v in recent_violations if v.severity == "critical"])
+        high_count = len([v for v in recent_violations if v.severity == "high"])
+        return self.security_level_for(len(recent_violations), critical_count, high_count)
+    
+    def security_level_for(self, recent_count: int, critical_count: int, high_count: int) -> str:
+        """Threat level for the given counts of recent violations"""
+        if not recent_count:
             return "secure"
         
-        critical_count = len([v for v in recent_violations if v["severity"] == "critical"])
-        high_count = len([v for v in recent_violations if v["severity"] == "high"])
-        
         if critical_count > 0:
             return "critical"
         elif high_count > 3:
             return "high"
-        elif high_count > 0 or len(recent_violations) > 5:
+        elif high_count > 0 or recent_count > 5:
             return "medium"
         else:
             return "low"
     
     # Helper methods for rate limiting
     def clean_rate_limit_log(self, window_start: float):
-        """Clean old rate limit log entries"""
-        if not hasattr(self, 'rate_limit_log'):
-            self.rate_limit_log = []
-        
-        self.rate_limit_log = [entry for entry in self.rate_limit_log if entry["timestamp"] > window_start]
+        """Clean old rate limit log entries, dropping keys with none left"""
+        for key in list(self.rate_limit_log):
+            timestamps = self.rate_limit_log[key]
+            while timestamps and timestamps[0] <= window_start:
+                timestamps.popleft()
+            if not timestamps:
+                del self.rate_limit_log[key]
     
     def count_recent_operations(self, operation_type: str, identifier: str, window_start: float) -> int:
         """Count recent operations of specified type"""
-        if not hasattr(self, 'rate_limit_log'):
+        timestamps = self.rate_limit_log.get((operation_type, identifier))
+        if not timestamps:
             return 0
         
-        return len([
-            entry for entry in self.rate_limit_log
-            if (entry["operation_type"] == operation_type and 
-                entry["identifier"] == identifier and 
-                entry["timestamp"] > window_start)
-        ])
+        while timestamps and timestamps[0] <= window_start:
+            timestamps.popleft()
+        return len(timestamps)
     
     def log_operation(self, operation_type: str, identifier: str, timestamp: float):
         """Log an operation for rate limiting"""
-        if not hasattr(self, 'rate_limit_log'):
-            self.rate_limit_log = []
-        
-        self.rate_limit_log.append({
-            "operation_type": operation_type,
-            "identifier": identifier,
-            "timestamp": timestamp
-        })
+        self.rate_limit_log[(operation_type, identifier)].append(timestamp)
 
 # Global validator instance
 wolfcog_validator = WolfCogInputValidator()
@@ -440,6 +925,10 @@ def validate_input(input_data: Any, input_type: str) -> Tuple[bool, List[str], A
     Returns:
         (is_valid, errors, sanitized_data)
     """
+    # Task specs are sanitized and validated together
+    if input_type == "task_spec" and isinstance(input_data, dict):
+        return wolfcog_validator.sanitize_and_validate_task_spec(input_data)
+    
     # Sanitize input first
     sanitized_data = wolfcog_validator.sanitize_input(input_data, input_type)
     